@@ -1,5 +1,6 @@
 import sys
 import os
+import argparse
 import platform
 import pkg_resources
 import itertools
@@ -25,6 +26,8 @@ from .dataresourceplugin import DataResourcePlugin
 from .controllerplugin import ControllerPlugin
 from .widgetplugin import QWidgetPlugin
 from .plugin import PluginType
+from .manifest import EntrypointManifest
+from .profiling import CollectionProfile
 
 try:
     # try to find the venvs entrypoint
@@ -42,13 +45,15 @@ from .hints import PlotHint, Hint
 
 from yapsy.PluginManager import NormalizePluginNameForModuleName, imp, log
 import importlib.util
-from queue import LifoQueue
+import types
+from queue import PriorityQueue, Empty
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from collections import defaultdict, namedtuple, OrderedDict
+import threading
 from enum import Enum, auto
 from contextlib import contextmanager
 from timeit import default_timer
 
-import time
-
 op_sys = platform.system()
 if op_sys == "Darwin":  # User config dir incompatible with venv on darwin (space in path name conflicts)
     user_plugin_dir = os.path.join(user_cache_dir(appname="xicam"), "plugins")
@@ -59,11 +64,29 @@ site_plugin_dir = os.path.join(site_config_dir(appname="xicam"), "plugins")
 qt_is_safe = False
 if "qtpy" in sys.modules:
     from qtpy.QtWidgets import QApplication
+    from qtpy.QtCore import QEventLoop, QTimer
 
     if QApplication.instance():
         qt_is_safe = True
 
 
+# Command-line flags of the plugin manager. The application's parser (xicam.core.args.parse_args) is defined in
+# Xi-cam.core, so these are declared here and parsed next to it, ignoring the flags they don't define. Abbreviations are
+# off, so that another program's flag (e.g. --profile) is never taken for one of these.
+_plugin_arg_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+_plugin_arg_parser.add_argument('--no-plugin-cache', dest='noplugincache', action='store_true',
+                                help='Rediscover plugin entrypoints instead of reading the on-disk manifest')
+_plugin_arg_parser.add_argument('--lazy-plugins', dest='lazyplugins', action='store_true',
+                                help='Import plugins on first use instead of during collection')
+_plugin_arg_parser.add_argument('--profile-plugins', dest='profileplugins', action='store_true',
+                                help='Export a profile of plugin collection to the user cache dir')
+
+
+def parse_plugin_args(args=None) -> argparse.Namespace:
+    """Parse the plugin manager's command-line flags from `args` (default is sys.argv), ignoring any others."""
+    return _plugin_arg_parser.parse_known_args(args)[0]
+
+
 @contextmanager
 def load_timer():
     start = default_timer()
@@ -73,6 +96,10 @@ def load_timer():
     elapser = lambda: end - start
 
 
+# Priority of plugins that have been explicitly requested; these jump ahead of everything else
+PROMOTED_PRIORITY = sys.maxsize
+
+
 class State(Enum):
     READY = auto()
     DISCOVERING = auto()
@@ -83,15 +110,42 @@ class State(Enum):
 class Filters(Enum):
     UPDATE = auto()
     COMPLETE = auto()
+    RELOAD = auto()  # observers attached to this filter receive the set of reloaded (type_name, name) pairs
+    DELTA = auto()  # observers attached to this filter receive a PluginDelta with each (coalesced) update
+
+
+# The plugins added and removed since the last update notification, as lists of (type_name, name) pairs
+PluginDelta = namedtuple('PluginDelta', ['added', 'removed'])
+
+# A picklable description of a plugin registry: {type_name: (module_name, object_name)} for plugin types, and a list of
+# (type_name, name, module_name, object_name) for plugins. See XicamPluginManager.snapshot
+RegistrySnapshot = namedtuple('RegistrySnapshot', ['plugin_types', 'entries'])
+
+
+class PluginQueue(PriorityQueue):
+    """
+    A queue of plugin collection tasks. Higher priorities are served first; equal priorities are served last-in,
+    first-out.
+    """
+
+    def __init__(self, maxsize=0):
+        super(PluginQueue, self).__init__(maxsize)
+        self._counter = itertools.count()
+
+    def put(self, item, priority=0, block=True, timeout=None):
+        super(PluginQueue, self).put((-priority, -next(self._counter), item), block, timeout)
+
+    def get(self, block=True, timeout=None):
+        return super(PluginQueue, self).get(block, timeout)[-1]
 
 
 class XicamPluginManager():
 
-    def __init__(self):
+    def __init__(self, snapshot: RegistrySnapshot = None):
 
         self._blacklist = []
-        self._load_queue = LifoQueue()
-        self._instantiate_queue = LifoQueue()
+        self._load_queue = PluginQueue()
+        self._instantiate_queue = PluginQueue()
         self._entrypoints = {}
         self._load_cache = {}
         self._observers = []
@@ -99,16 +153,73 @@ class XicamPluginManager():
         self.type_mapping = {}
         self.plugin_types = {}
 
+        # Reverse indices from plugin name to {type_name: plugin} and {type_name: entrypoint}, for untyped lookups
+        self._name_index = {}
+        self._entrypoint_index = {}
+        # Reverse index from a plugin's class name to {(type_name, name): None}, e.g. for unpickling
+        self._class_name_index = {}
+
+        # Load/instantiate priorities by plugin type and by plugin name (names take precedence); higher goes first
+        self.type_priorities = {}
+        self.plugin_priorities = {}
+
+        plugin_args = parse_plugin_args()
+
+        # Cache discovered entrypoints on disk; invalidated automatically when installed packages change
+        self.use_manifest_cache = not plugin_args.noplugincache
+        self._manifest = EntrypointManifest()
+
+        # Number of threads used to import entrypoints; with more than one, independent plugin modules import
+        # concurrently (C extensions that release the GIL overlap instead of queueing)
+        self.load_workers = 1
+        self._import_locks = defaultdict(threading.RLock)
+        self._import_locks_guard = threading.Lock()
+
+        # In lazy mode, discovered plugins are registered as LazyPluginProxy objects and only imported on first use
+        self.lazy_load = plugin_args.lazyplugins
+
+        # Exceptions of plugins that failed to load or instantiate, by (type_name, name); cleared on rediscovery
+        self.failed_plugins = {}
+
+        # Without a Qt event loop, collect synchronously: no loader thread and no event round-trip per plugin, and
+        # collection is complete when collect_plugins() returns
+        self.synchronous = not qt_is_safe
+
+        # Structured profile of plugin collection (see `enable_profiling`); --profile-plugins also exports it to the
+        # user cache dir when collection completes
+        self.profile = None
+        self._export_profile = plugin_args.profileplugins
+        if self._export_profile:
+            self.enable_profiling()
+
+        # Update notifications arriving within this many seconds of each other are coalesced into one
+        self.notify_interval = 0.1
+        self._pending_added = OrderedDict()
+        self._pending_removed = OrderedDict()
+        self._pending_lock = threading.Lock()
+        self._last_flush = 0
+
+        # Futures for plugins that have been requested before they were instantiated, keyed by (type_name, name)
+        self._plugin_futures = {}
+        self._plugin_futures_lock = threading.Lock()
+
         # Remember all modules loaded before any plugins are loaded; don't bother unloading these
         self._preloaded_modules = set(sys.modules.keys())
 
+        # (mtime, size) of the source files of modules loaded by plugins, to detect changes for hot_reload
+        self._module_stamps = {}
+        self._reloading_plugins = set()
+
         # Observe changes to venvs
         if venvsobservers is not None:
             venvsobservers.append(self)
 
         # Load plugin types
-        self.plugin_types = {name: ep.load() for name, ep in
-                             entrypoints.get_group_named('xicam.plugins.PluginType').items()}
+        if snapshot is not None:
+            self.plugin_types = self._load_snapshot_types(snapshot)
+        else:
+            plugin_type_group, _ = self._get_entrypoint_group('xicam.plugins.PluginType')
+            self.plugin_types = {name: ep.load() for name, ep in plugin_type_group.items()}
 
         # Toss plugin types that need qt if running without qt
         if not qt_is_safe:
@@ -116,9 +227,7 @@ class XicamPluginManager():
                                  not getattr(type_class, 'needs_qt', True)}
 
         # Initialize types
-        self.type_mapping = {type_name: {} for type_name in self.plugin_types.keys()}
-        self._entrypoints = {type_name: {} for type_name in self.plugin_types.keys()}
-        self._load_cache = {type_name: {} for type_name in self.plugin_types.keys()}
+        self._initialize_types()
 
         # Check if cammart should be ignored
         try:
@@ -132,13 +241,24 @@ class XicamPluginManager():
         if not include_cammart:
             self._blacklist.extend(['cammart', 'venvs'])
 
+        if snapshot is not None:
+            self.hydrate(snapshot)
+
     def collect_plugins(self):
         """
         Find, load, and instantiate all Xi-cam plugins matching known plugin types
 
         """
         self._discover_plugins()
-        self._load_plugins()
+        if self.lazy_load:
+            # Nothing to load up front; proxies import their plugins on demand
+            self.state = State.READY
+            msg.logMessage('Plugin collection completed (lazy)!')
+            self._finish_profile()
+            self._flush_updates(force=True)
+            self._notify(Filters.COMPLETE)
+        else:
+            self._load_plugins()
 
     def collect_plugin(self, plugin_name, plugin_class, type_name, replace=False):
         """
@@ -147,9 +267,7 @@ class XicamPluginManager():
         """
         if replace:
             # Clear cache by name
-            self._entrypoints[type_name].pop(plugin_name, None)
-            self.type_mapping[type_name].pop(plugin_name, None)
-            self._load_cache[type_name].pop(plugin_name, None)
+            self._unregister_plugin(type_name, plugin_name)
         else:
             try:
                 assert plugin_name not in self.type_mapping[type_name]
@@ -160,39 +278,229 @@ class XicamPluginManager():
         # Start a special collection cycle
         self.state = State.DISCOVERING
         live_entry_point = LiveEntryPoint(plugin_name, plugin_class)
-        self._load_queue.put((type_name, live_entry_point))
+        self._load_queue.put((type_name, live_entry_point), self._priority(type_name, plugin_name))
+        if self.profile:
+            self.profile.queued(type_name, live_entry_point)
         if self.state == State.DISCOVERING:
             self.state = State.LOADING
         self._load_plugins()
 
     def _unload_plugins(self):
         assert self.state == State.READY
-        self._load_queue = LifoQueue()
-        self._instantiate_queue = LifoQueue()
+        self._load_queue = PluginQueue()
+        self._instantiate_queue = PluginQueue()
 
         # Initialize types
-        self.type_mapping = {type_name: {} for type_name in self.plugin_types.keys()}
-        self._entrypoints = {type_name: {} for type_name in self.plugin_types.keys()}
-        self._load_cache = {type_name: {} for type_name in self.plugin_types.keys()}
+        self._initialize_types()
+        self._plugin_futures = {}
+        self._module_stamps = {}
 
         reload_candidates = list(filter(lambda key: key.startswith('xicam.'), sys.modules.keys()))
         for module_name in reload_candidates:
             if module_name not in self._preloaded_modules:
                 del (sys.modules[module_name])
 
+    def _initialize_types(self):
+        self.type_mapping = {type_name: {} for type_name in self.plugin_types.keys()}
+        self._entrypoints = {type_name: {} for type_name in self.plugin_types.keys()}
+        self._load_cache = {type_name: {} for type_name in self.plugin_types.keys()}
+        self._name_index = {}
+        self._entrypoint_index = {}
+        self._class_name_index = {}
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        Export a compact, picklable snapshot of the plugin registry (names, types and import references).
+
+        A worker process can `hydrate` its manager from the snapshot instead of re-running discovery; plugins are then
+        imported lazily, as they are used. Plugins that failed to load are left out. For example, pass the snapshot to a process pool's initializer, which calls
+        `xicam.plugins.manager.hydrate(snapshot)`.
+        """
+        plugin_types = {type_name: (type_class.__module__, type_class.__qualname__)
+                        for type_name, type_class in self.plugin_types.items()}
+
+        entries = []
+        for type_name, entrypoints_by_name in self._entrypoints.items():
+            for name, entrypoint in entrypoints_by_name.items():
+                # Workers would only fail to import these again
+                if (type_name, name) in self.failed_plugins:
+                    continue
+                entries.append((type_name, name, entrypoint.module_name, entrypoint.object_name))
+
+            # Plugins registered in memory with collect_plugin can be included if they are importable
+            for name, plugin_class in self._load_cache[type_name].items():
+                if name in entrypoints_by_name:
+                    continue
+                module_name = getattr(plugin_class, '__module__', None)
+                object_name = getattr(plugin_class, '__qualname__', '<locals>')
+                if module_name in (None, '__main__') or '<locals>' in object_name:
+                    msg.logMessage(f'The in-memory plugin {name} is not importable and will not be included in the '
+                                   f'registry snapshot.', level=msg.WARNING)
+                    continue
+                entries.append((type_name, name, module_name, object_name))
+
+        return RegistrySnapshot(plugin_types, entries)
+
+    @staticmethod
+    def _load_snapshot_types(snapshot):
+        return {type_name: entrypoints.EntryPoint(type_name, module_name, object_name).load()
+                for type_name, (module_name, object_name) in snapshot.plugin_types.items()}
+
+    def hydrate(self, snapshot: RegistrySnapshot):
+        """
+        Replace this manager's registry with the contents of `snapshot`, without any discovery.
+
+        Plugins are registered as lazy proxies, so only the plugins actually used are imported.
+        """
+        assert self.state == State.READY
+        plugin_types = self._load_snapshot_types(snapshot)
+
+        # Toss plugin types that need qt if running without qt
+        if not qt_is_safe:
+            plugin_types = {type_name: type_class for type_name, type_class in plugin_types.items() if
+                            not getattr(type_class, 'needs_qt', True)}
+
+        self.plugin_types = plugin_types
+        self._initialize_types()
+
+        for type_name, name, module_name, object_name in snapshot.entries:
+            if type_name not in self.plugin_types:
+                continue
+            entrypoint = entrypoints.EntryPoint(name, module_name, object_name)
+            self._add_entrypoint(type_name, name, entrypoint)
+            self._register_plugin(type_name, name, LazyPluginProxy(self, type_name, entrypoint))
+
+        msg.logMessage(f'Plugin registry hydrated with {len(snapshot.entries)} plugins.')
+        self._finish_profile()
+        self._flush_updates(force=True)
+        self._notify(Filters.COMPLETE)
+
     def hot_reload(self):
+        """
+        Re-import plugin modules that have changed on disk (and the modules that depend on them), then re-collect only
+        the affected plugins. Observers attached to `Filters.RELOAD` are notified with the set of reloaded plugins.
+
+        If no module changes can be tracked (e.g. plugins haven't finished collecting yet), everything is reloaded.
+        """
         warnings.warn('Hot-reloading plugins; unexpected and unpredictable behavior may occur...', UserWarning)
-        self._unload_plugins()
-        self.collect_plugins()
+
+        if not self._module_stamps:
+            self._unload_plugins()
+            self.collect_plugins()
+            return
+
+        changed_modules = self._changed_modules()
+        if not changed_modules:
+            msg.logMessage('No plugin modules have changed; nothing to reload.')
+            return
+
+        affected_modules = self._dependent_modules(changed_modules)
+        msg.logMessage('Reloading changed plugin modules:', ', '.join(sorted(affected_modules)))
+
+        # Find the plugins that come from affected modules (in-memory plugins can't be re-imported)
+        affected_plugins = []
+        for type_name, entrypoints_by_name in self._entrypoints.items():
+            for name, entrypoint in entrypoints_by_name.items():
+                plugin_class = self._load_cache[type_name].get(name, None)
+                if entrypoint.module_name in affected_modules or \
+                        getattr(plugin_class, '__module__', None) in affected_modules:
+                    affected_plugins.append((type_name, entrypoint))
+
+        for module_name in affected_modules:
+            sys.modules.pop(module_name, None)
+            self._module_stamps.pop(module_name, None)
+
+        for type_name, entrypoint in affected_plugins:
+            self._unregister_plugin(type_name, entrypoint.name, forget_entrypoint=False)
+
+        self._reloading_plugins = {(type_name, entrypoint.name) for type_name, entrypoint in affected_plugins}
+
+        # Start a special collection cycle for just the affected plugins
+        self.state = State.LOADING
+        for type_name, entrypoint in affected_plugins:
+            self._load_queue.put((type_name, entrypoint), self._priority(type_name, entrypoint.name))
+        self._load_plugins()
+
+    def _stamp_modules(self):
+        """ Record the source file stamps of any newly loaded, non-preloaded modules."""
+        for module_name, module in list(sys.modules.items()):
+            if module_name in self._preloaded_modules or module_name in self._module_stamps:
+                continue
+            path = getattr(module, '__file__', None)
+            if not path:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            self._module_stamps[module_name] = (path, stat.st_mtime_ns, stat.st_size)
+
+    def _changed_modules(self):
+        changed = set()
+        for module_name, (path, mtime, size) in self._module_stamps.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                changed.add(module_name)  # removed; let the reload fail loudly
+                continue
+            if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+                changed.add(module_name)
+        return changed
+
+    def _dependent_modules(self, changed_modules):
+        """
+        Expand a set of modules to include all tracked modules that (transitively) reference them, or the classes and
+        functions defined in them.
+        """
+        dependencies = {}
+        for module_name in self._module_stamps:
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+            module_dependencies = set()
+            for value in list(vars(module).values()):
+                try:
+                    if isinstance(value, types.ModuleType):
+                        # packages hold their submodules as attributes; that alone is not a dependency
+                        if not value.__name__.startswith(f'{module_name}.'):
+                            module_dependencies.add(value.__name__)
+                    else:
+                        module_dependencies.add(getattr(value, '__module__', None))
+                except Exception:  # arbitrary objects can misbehave on attribute access
+                    continue
+            dependencies[module_name] = module_dependencies
+
+        affected = set(changed_modules)
+        frontier = set(changed_modules)
+        while frontier:
+            frontier = {module_name for module_name, module_dependencies in dependencies.items()
+                        if module_name not in affected and module_dependencies & frontier}
+            affected |= frontier
+        return affected
+
+    def _get_entrypoint_group(self, group_name):
+        """ Get a tuple of (dict of entrypoints by name, list of all entrypoints) for a group, using the manifest cache
+        if enabled."""
+        if self.use_manifest_cache:
+            return self._manifest.get_group(group_name)
+        return entrypoints.get_group_named(group_name), entrypoints.get_group_all(group_name)
 
     def _discover_plugins(self):
         self.state = State.DISCOVERING
+
+        # validate the manifest cache against the current environment (packages may have been installed since)
+        if self.use_manifest_cache:
+            self._manifest.refresh()
+
         # for each plugin type
         for type_name in self.plugin_types.keys():
 
             # get all entrypoints matching that group
-            group = entrypoints.get_group_named(f'xicam.plugins.{type_name}')
-            group_all = entrypoints.get_group_all(f'xicam.plugins.{type_name}')
+            discovery_start = default_timer()
+            group, group_all = self._get_entrypoint_group(f'xicam.plugins.{type_name}')
+            if self.profile:
+                self.profile.discovered(type_name, list(group.values()), discovery_start,
+                                        default_timer() - discovery_start)
 
             # check for duplicate names
             self._check_shadows(group, group_all)
@@ -200,13 +508,23 @@ class XicamPluginManager():
             for name, entrypoint in group.items():
                 # If this entrypoint hasn't already been queued
                 if entrypoint not in self._entrypoints[type_name] and entrypoint.name not in self._blacklist:
-                    # ... queue and cache it
-                    self._load_queue.put((type_name, entrypoint))
-                    self._entrypoints[type_name][name] = entrypoint
+                    # ... queue (or register a proxy for) and cache it
+                    if self.lazy_load:
+                        if name not in self.type_mapping[type_name]:
+                            self._register_plugin(type_name, name, LazyPluginProxy(self, type_name, entrypoint))
+                    else:
+                        self._load_queue.put((type_name, entrypoint), self._priority(type_name, name))
+                        if self.profile:
+                            self.profile.queued(type_name, entrypoint)
+                    self._add_entrypoint(type_name, name, entrypoint)
 
             msg.logMessage(f"Discovered {type_name} entrypoints:",
                            *self._entrypoints[type_name].values(),
                            sep='\n')
+
+        if self.use_manifest_cache:
+            self._manifest.save()
+
         if self.state == State.DISCOVERING:
             self.state = State.LOADING
 
@@ -223,138 +541,469 @@ class XicamPluginManager():
                         f"There are {len(matches)} conflicting entrypoints which share the name {name!r}:\n{matches}"
                         f"Loading entrypoint from {winner.module_name} and ignoring others.")
 
+    def _load_plugins(self):
+        if self.synchronous:
+            self._load_entrypoints()
+
+            # Instantiate everything that loaded, in priority order
+            while self._instantiate_next():
+                pass
+            self._check_complete()
+        else:
+            self._load_plugins_in_thread()
+
     @threads.method(threadkey='entrypoint-loader',
                     showBusy=False,
                     cancelIfRunning=False)  # progress state managed independently
-    def _load_plugins(self):
-        started_instantiating = False
+    def _load_plugins_in_thread(self):
+        self._load_entrypoints()
+
+    def _load_entrypoints(self):
+        if self.load_workers > 1:
+            self._load_plugins_parallel()
+        else:
+            started_instantiating = False
 
-        # For every entrypoint in the load queue
-        while not self._load_queue.empty():
-            type_name, entrypoint = self._load_queue.get()
+            # For every entrypoint in the load queue
+            while not self._load_queue.empty():
+                type_name, entrypoint = self._load_queue.get()
 
-            # load it
-            self._load_plugin(type_name, entrypoint)
+                # load it
+                self._load_plugin(type_name, entrypoint)
 
-            if not started_instantiating:  # If this is the first load
-                # Start an event chain to pull from the queue
-                threads.invoke_as_event(self._instantiate_plugin)
-                started_instantiating = True
+                if not started_instantiating:  # If this is the first load
+                    # Start an event chain to pull from the queue
+                    self._start_instantiating()
+                    started_instantiating = True
 
-            # mark it as completed
-            self._load_queue.task_done()
+                # mark it as completed
+                self._load_queue.task_done()
 
         # Finished loading, progress
         if self.state == State.LOADING:
             self.state = State.INSTANTIATING
 
-    def _load_plugin(self, type_name, entrypoint: entrypoints.EntryPoint):
-        # if the entrypoint was already loaded into cache and queued, do nothing
-        if self._load_cache[type_name].get(entrypoint.name, None):
-            return
+    def _load_plugins_parallel(self):
+        started_instantiating = [False]
+        started_instantiating_lock = threading.Lock()
+
+        def load_worker():
+            # Pull entrypoints from the load queue until it is exhausted
+            while True:
+                try:
+                    type_name, entrypoint = self._load_queue.get_nowait()
+                except Empty:
+                    return
 
+                try:
+                    # load it; each loaded class is put on the instantiate queue as soon as it finishes
+                    self._load_plugin(type_name, entrypoint)
+                finally:
+                    self._load_queue.task_done()
+
+                with started_instantiating_lock:
+                    if not started_instantiating[0]:  # If this is the first load
+                        # Start an event chain to pull from the queue
+                        self._start_instantiating()
+                        started_instantiating[0] = True
+
+        with ThreadPoolExecutor(max_workers=self.load_workers) as executor:
+            workers = [executor.submit(load_worker) for _ in range(self.load_workers)]
+            for worker in workers:
+                worker.result()
+
+    def _import_lock(self, module_name):
+        """ Get a lock that serializes entrypoint loads from the same module."""
+        with self._import_locks_guard:
+            return self._import_locks[module_name]
+
+    def enable_profiling(self, trace_imports=True):
+        """
+        Start recording a structured profile of plugin collection into `self.profile`.
+
+        The profile covers discovery, queue waits, imports (with nested imports, if `trace_imports`), instantiation,
+        and failures of every entrypoint; export it with `profile.to_json()` or `profile.to_chrome_trace()`.
+        """
+        self.disable_profiling()
+        self.profile = CollectionProfile(trace_imports=trace_imports)
+        return self.profile
+
+    def disable_profiling(self):
+        """ Stop profiling; returns the finished profile (if any)."""
+        profile, self.profile = self.profile, None
+        if profile:
+            profile.stop_import_tracing()
+        return profile
+
+    @contextmanager
+    def _profile_stage(self, stage, type_name, entrypoint):
+        if self.profile is None:
+            yield
+        else:
+            with self.profile.stage(stage, type_name, entrypoint):
+                yield
+
+    def _finish_profile(self):
+        # Called whenever collection completes: stop timing imports, and export the profile if requested
+        if self.profile:
+            self.profile.stop_import_tracing()
+            if self._export_profile:
+                self._save_profile()
+
+    def _save_profile(self):
+        profile_path = os.path.join(user_cache_dir(appname="xicam"), "plugin_profile.json")
+        trace_path = os.path.join(user_cache_dir(appname="xicam"), "plugin_profile.trace.json")
         try:
-            # Load the entrypoint (unless already cached), cache it, and put it on the instantiate queue
-            msg.logMessage(f'Loading entrypoint {entrypoint.name} from module: {entrypoint.module_name}')
-            with load_timer() as elapsed:
-                plugin_class = self._load_cache[type_name][entrypoint.name] = \
-                    self._load_cache[type_name].get(entrypoint.name, None) or entrypoint.load()
-        except (Exception, SystemError) as ex:
-            msg.logMessage(f"Unable to load {entrypoint.name} plugin from module: {entrypoint.module_name}", msg.ERROR)
+            self.profile.to_json(profile_path)
+            self.profile.to_chrome_trace(trace_path)
+        except OSError as ex:
             msg.logError(ex)
-            msg.notifyMessage(
-                repr(ex), title=f'An error occurred while starting the "{entrypoint.name}" plugin.', level=msg.CRITICAL
-            )
-
         else:
-            msg.logMessage(f"{int(elapsed() * 1000)} ms elapsed while loading {entrypoint.name}",
-                           level=msg.INFO)
-            self._instantiate_queue.put((type_name, entrypoint, plugin_class))
+            msg.logMessage(f'Plugin collection profile written to {profile_path} and {trace_path}.')
 
-    def _instantiate_plugin(self):
-        if not self._instantiate_queue.empty():
-            type_name, entrypoint, plugin_class = self._instantiate_queue.get()
+    def _priority(self, type_name, name):
+        return self.plugin_priorities.get(name, self.type_priorities.get(type_name, 0))
 
-            # if this plugin was already instantiated earlier, skip it; mark done
-            if self.type_mapping[type_name].get(entrypoint.name, None) is None:
+    def prioritize(self, *names, priority=PROMOTED_PRIORITY):
+        """
+        Collect the plugins named `names` ahead of others, e.g. plugins named on the command line or in a saved
+        workflow. May be called before or during collection.
+        """
+        for name in names:
+            self.plugin_priorities[name] = priority
+
+            # re-queue any pending load at the new priority; the stale queue entry is skipped once loaded
+            if self.state in [State.DISCOVERING, State.LOADING]:
+                for type_name, entrypoint in self._entrypoint_index.get(name, {}).items():
+                    if not self._load_cache[type_name].get(name, None):
+                        self._load_queue.put((type_name, entrypoint), priority)
+
+    def _load_plugin(self, type_name, entrypoint: entrypoints.EntryPoint, priority=None):
+        # if the entrypoint was already loaded into cache and queued, do nothing (unless it is being promoted)
+        plugin_class = self._load_cache[type_name].get(entrypoint.name, None)
+        if plugin_class:
+            if priority is not None and not self._is_collected(type_name, entrypoint.name):
+                self._instantiate_queue.put((type_name, entrypoint, plugin_class), priority)
+            return
 
-                # inject the entrypoint name into the class
-                plugin_class._name = entrypoint.name
+        if priority is None:
+            priority = self._priority(type_name, entrypoint.name)
 
-                success = False
+        # Load the entrypoint, cache it, and put it on the instantiate queue
+        plugin_class = self._load_entrypoint(type_name, entrypoint)
+        if plugin_class is not None:
+            self._instantiate_queue.put((type_name, entrypoint, plugin_class), priority)
+        else:
+            # Don't leave anyone waiting on a plugin that will never arrive
+            self._complete_plugin_future(type_name, entrypoint.name,
+                                         exception=ImportError(f'The plugin named {entrypoint.name} could not be '
+                                                               f'loaded from module: {entrypoint.module_name}'))
+
+    def _load_entrypoint(self, type_name, entrypoint: entrypoints.EntryPoint):
+        """ Load an entrypoint (unless already cached) and cache it. Returns None if loading fails."""
+        # Only one thread may import from a given module at a time
+        with self._import_lock(entrypoint.module_name):
+            plugin_class = self._load_cache[type_name].get(entrypoint.name, None)
+            if plugin_class:
+                return plugin_class
 
-                # ... and instantiate it (as long as its supposed to be singleton)
+            try:
+                msg.logMessage(f'Loading entrypoint {entrypoint.name} from module: {entrypoint.module_name}')
+                with load_timer() as elapsed, self._profile_stage('import', type_name, entrypoint):
+                    plugin_class = self._load_cache[type_name][entrypoint.name] = entrypoint.load()
+            except (Exception, SystemError) as ex:
+                self.failed_plugins[(type_name, entrypoint.name)] = ex
+                msg.logMessage(f"Unable to load {entrypoint.name} plugin from module: {entrypoint.module_name}", msg.ERROR)
+                msg.logError(ex)
+                msg.notifyMessage(
+                    repr(ex), title=f'An error occurred while starting the "{entrypoint.name}" plugin.', level=msg.CRITICAL
+                )
+                return None
 
-                try:
-                    if getattr(plugin_class, 'is_singleton', False):
-                        msg.logMessage(f"Instantiating {entrypoint.name} plugin object.", level=msg.INFO)
-                        with load_timer() as elapsed:
-                            self.type_mapping[type_name][entrypoint.name] = plugin_class()
+            msg.logMessage(f"{int(elapsed() * 1000)} ms elapsed while loading {entrypoint.name}",
+                           level=msg.INFO)
+            return plugin_class
 
-                        msg.logMessage(f"{int(elapsed() * 1000)} ms elapsed while instantiating {entrypoint.name}",
-                                       level=msg.INFO)
-                    else:
-                        self.type_mapping[type_name][entrypoint.name] = plugin_class
-                    success = True
+    def _is_collected(self, type_name, name):
+        plugin = self.type_mapping[type_name].get(name, None)
+        return plugin is not None and not isinstance(plugin, LazyPluginProxy)
 
-                except (Exception, SystemError) as ex:
-                    msg.logMessage(
-                        f"Unable to instantiate {entrypoint.name} plugin from module: {entrypoint.module_name}",
-                        msg.ERROR)
-                    msg.logError(ex)
-                    msg.notifyMessage(repr(ex),
-                                      title=f'An error occurred while starting the "{entrypoint.name}" plugin.')
+    def _start_instantiating(self):
+        # In synchronous mode, instantiation is driven by _load_plugins once loading finishes
+        if not self.synchronous:
+            threads.invoke_as_event(self._instantiate_plugin)
+
+    def _instantiate_plugin(self):
+        self._instantiate_next()
+        self._flush_updates()
+        self._check_complete()
 
-                if success:
-                    msg.logMessage(f"Successfully collected {entrypoint.name} plugin.", level=msg.INFO)
-                    msg.showProgress(self._progress_count(), maxval=self._entrypoint_count())
-                    self._notify(Filters.UPDATE)
+        if not self.state == State.READY:  # if we haven't reached the last task, but there's nothing queued
+            threads.invoke_as_event(self._instantiate_plugin)  # return to the event loop, but come back soon
+
+    def _instantiate_next(self):
+        """ Instantiate the next plugin on the instantiate queue. Returns False if the queue was empty."""
+        try:
+            type_name, entrypoint, plugin_class = self._instantiate_queue.get_nowait()
+        except Empty:
+            return False
 
-            # mark it as completed
-            self._instantiate_queue.task_done()
+        # if this plugin was already instantiated earlier, skip it; mark done
+        if not self._is_collected(type_name, entrypoint.name):
+            self._instantiate(type_name, entrypoint, plugin_class)
 
+        # mark it as completed
+        self._instantiate_queue.task_done()
+        return True
+
+    def _check_complete(self):
         # If this was the last plugin
         if self._load_queue.empty() and self._instantiate_queue.empty() and self.state in [State.INSTANTIATING,
                                                                                            State.READY]:
             self.state = State.READY
             msg.logMessage('Plugin collection completed!')
             msg.hideProgress()
+            self._finish_profile()
+            self._stamp_modules()
+            self._flush_updates(force=True)
+            if self._reloading_plugins:
+                reloaded_plugins, self._reloading_plugins = self._reloading_plugins, set()
+                self._notify(Filters.RELOAD, reloaded_plugins)
             self._notify(Filters.COMPLETE)
 
-        if not self.state == State.READY:  # if we haven't reached the last task, but there's nothing queued
-            threads.invoke_as_event(self._instantiate_plugin)  # return to the event loop, but come back soon
+    def _instantiate(self, type_name, entrypoint, plugin_class):
+        """ Instantiate a loaded plugin class (if it is a singleton) and register it. Returns None on failure."""
+        # inject the entrypoint name into the class
+        plugin_class._name = entrypoint.name
+
+        plugin = None
+
+        # ... and instantiate it (as long as its supposed to be singleton)
+
+        try:
+            if getattr(plugin_class, 'is_singleton', False):
+                msg.logMessage(f"Instantiating {entrypoint.name} plugin object.", level=msg.INFO)
+                with load_timer() as elapsed, self._profile_stage('instantiate', type_name, entrypoint):
+                    plugin = plugin_class()
+                self._register_plugin(type_name, entrypoint.name, plugin)
+
+                msg.logMessage(f"{int(elapsed() * 1000)} ms elapsed while instantiating {entrypoint.name}",
+                               level=msg.INFO)
+            else:
+                plugin = plugin_class
+                self._register_plugin(type_name, entrypoint.name, plugin)
+
+        except (Exception, SystemError) as ex:
+            self.failed_plugins[(type_name, entrypoint.name)] = ex
+            msg.logMessage(
+                f"Unable to instantiate {entrypoint.name} plugin from module: {entrypoint.module_name}",
+                msg.ERROR)
+            msg.logError(ex)
+            msg.notifyMessage(repr(ex),
+                              title=f'An error occurred while starting the "{entrypoint.name}" plugin.')
+            self._complete_plugin_future(type_name, entrypoint.name, exception=ex)
+
+        else:
+            msg.logMessage(f"Successfully collected {entrypoint.name} plugin.", level=msg.INFO)
+            self._complete_plugin_future(type_name, entrypoint.name, plugin=plugin)
+
+        return plugin
+
+    def _flush_updates(self, force=False):
+        """
+        Send one UPDATE notification (and a PluginDelta to DELTA observers) for all plugins added or removed since the
+        last one, provided `notify_interval` has passed (or `force`).
+        """
+        with self._pending_lock:
+            if not (self._pending_added or self._pending_removed):
+                return
+            if not force and default_timer() - self._last_flush < self.notify_interval:
+                return
+            delta = PluginDelta(list(self._pending_added), list(self._pending_removed))
+            self._pending_added.clear()
+            self._pending_removed.clear()
+            self._last_flush = default_timer()
+
+        if self.state != State.READY:
+            msg.showProgress(self._progress_count(), maxval=self._entrypoint_count())
+        self._notify(Filters.UPDATE)
+        self._notify(Filters.DELTA, delta)
+
+    def _plugin_future(self, type_name, name):
+        """ Get the future that completes when the plugin `name` of type `type_name` is instantiated."""
+        with self._plugin_futures_lock:
+            future = self._plugin_futures.get((type_name, name))
+            if future is None:
+                future = self._plugin_futures[(type_name, name)] = Future()
+                # it may have been instantiated before we started listening
+                if self._is_collected(type_name, name):
+                    future.set_result(self.type_mapping[type_name][name])
+            return future
+
+    def _complete_plugin_future(self, type_name, name, plugin=None, exception=None):
+        with self._plugin_futures_lock:
+            future = self._plugin_futures.pop((type_name, name), None)
+        if future is None or future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(plugin)
+
+    def _resolve_proxy(self, proxy):
+        """
+        Import and instantiate the plugin behind a LazyPluginProxy, replacing the proxy in `type_mapping`.
+
+        The import happens in the calling thread. With Qt, instantiation (e.g. of GUIPlugin widgets) and the resulting
+        notifications are marshalled to the main thread, and the caller blocks until they are done. A plugin that
+        fails to load is evicted, and its failure is recorded in `failed_plugins`.
+        """
+        type_name, entrypoint = proxy.type_name, proxy.entrypoint
+        key = (type_name, entrypoint.name)
+
+        plugin_class = None
+        with self._import_lock(entrypoint.module_name):
+            # another thread may have resolved this plugin already
+            if self._is_collected(type_name, entrypoint.name):
+                return self.type_mapping[type_name][entrypoint.name]
+            if key not in self.failed_plugins:
+                plugin_class = self._load_entrypoint(type_name, entrypoint)
+
+        plugin = None
+        if plugin_class is not None:
+            if qt_is_safe:
+                # Outside of the import lock, which the main thread may be waiting for
+                plugin = self._in_main_thread(self._instantiate_proxy, type_name, entrypoint, plugin_class)
+            else:
+                with self._import_lock(entrypoint.module_name):
+                    plugin = self._instantiate_proxy(type_name, entrypoint, plugin_class)
+
+        if plugin is None:
+            # Evict the proxy, so that it isn't imported again on every access
+            if self.type_mapping[type_name].get(entrypoint.name) is proxy:
+                self._unregister_plugin(type_name, entrypoint.name)
+                self._in_main_thread(self._flush_updates, True)
+            raise ImportError(f'The plugin named {entrypoint.name} could not be loaded from module: '
+                              f'{entrypoint.module_name}') from self.failed_plugins.get(key)
+
+        return plugin
+
+    def _instantiate_proxy(self, type_name, entrypoint, plugin_class):
+        if self._is_collected(type_name, entrypoint.name):
+            return self.type_mapping[type_name][entrypoint.name]
+
+        plugin = self._instantiate(type_name, entrypoint, plugin_class)
+        if plugin is not None:
+            # track the newly imported modules for hot_reload
+            self._stamp_modules()
+            self._flush_updates(force=True)
+        return plugin
+
+    @staticmethod
+    def _in_main_thread(func, *args):
+        """ Call `func` in the main thread when Qt is in use, blocking until it returns (or raises)."""
+        if not qt_is_safe or threads.is_main_thread():
+            return func(*args)
+
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(func(*args))
+            except BaseException as ex:
+                future.set_exception(ex)
+
+        threads.invoke_as_event(run)
+        return future.result()
+
+    def _add_entrypoint(self, type_name, name, entrypoint):
+        self._entrypoints[type_name][name] = entrypoint
+        self.failed_plugins.pop((type_name, name), None)
+        self._entrypoint_index.setdefault(name, {})[type_name] = entrypoint
+        if entrypoint.object_name:
+            self._class_name_index.setdefault(entrypoint.object_name.rsplit('.', 1)[-1], {})[(type_name, name)] = None
+
+    @staticmethod
+    def _class_name(plugin):
+        if isinstance(plugin, LazyPluginProxy):
+            object_name = plugin.entrypoint.object_name
+            return object_name.rsplit('.', 1)[-1] if object_name else None
+        if isinstance(plugin, type):
+            return plugin.__name__
+        return type(plugin).__name__
+
+    def _register_plugin(self, type_name, name, plugin):
+        self.type_mapping[type_name][name] = plugin
+        if plugin is not None:
+            self._name_index.setdefault(name, {})[type_name] = plugin
+            # Plugins collected in memory have no entrypoint to index their class name from
+            class_name = self._class_name(plugin)
+            if class_name:
+                self._class_name_index.setdefault(class_name, {})[(type_name, name)] = None
+
+        with self._pending_lock:
+            self._pending_added[(type_name, name)] = None
+
+    def _unregister_plugin(self, type_name, name, forget_entrypoint=True):
+        """ Purge a plugin from all caches and indices by name. Its entrypoint is kept if not `forget_entrypoint`."""
+        plugin = self.type_mapping[type_name].pop(name, None)
+        if plugin is not None:
+            with self._pending_lock:
+                # if observers haven't heard about it yet, they don't need to hear that it's gone
+                if (type_name, name) in self._pending_added:
+                    del self._pending_added[(type_name, name)]
+                else:
+                    self._pending_removed[(type_name, name)] = None
+        self._load_cache[type_name].pop(name, None)
+        indices = [self._name_index]
+        if forget_entrypoint:
+            entrypoint = self._entrypoints[type_name].pop(name, None)
+            indices.append(self._entrypoint_index)
+            class_names = {self._class_name(plugin)} if plugin is not None else set()
+            if entrypoint is not None and entrypoint.object_name:
+                class_names.add(entrypoint.object_name.rsplit('.', 1)[-1])
+            for class_name in class_names:
+                matches = self._class_name_index.get(class_name, {})
+                matches.pop((type_name, name), None)
+                if not matches:
+                    self._class_name_index.pop(class_name, None)
+        for index in indices:
+            matches = index.get(name, {})
+            matches.pop(type_name, None)
+            if not matches:
+                index.pop(name, None)
+
+    @staticmethod
+    def _lookup(index, name):
+        matches = index.get(name)
+        if not matches:
+            return None, None
+        if len(matches) > 1:
+            raise ValueError('Multiple plugins with the same name but different types exist. '
+                             'Must specify type_name.')
+        type_name, match = next(iter(matches.items()))
+        return match, type_name
 
     def _get_plugin_by_name(self, name, type_name):
-        return_plugin = None
-        # Check all types matching type_name
-        for search_type_name in self.plugin_types.keys():
-            if type_name == search_type_name or not type_name:
-                match_plugin = self.type_mapping[search_type_name].get(name, None)
-                if match_plugin and return_plugin:
-                    raise ValueError('Multiple plugins with the same name but different types exist. '
-                                     'Must specify type_name.')
-                return_plugin = match_plugin
+        if type_name:
+            return self.type_mapping.get(type_name, {}).get(name, None)
 
+        return_plugin, _ = self._lookup(self._name_index, name)
         return return_plugin
 
     def _get_entrypoint_by_name(self, name, type_name):
-        return_entrypoint = None
-        return_type = None
-        # Check all types matching type_name
-        for search_type_name in self.plugin_types.keys():
-            if type_name == search_type_name or not type_name:
-                match_entrypoint = self._entrypoints[search_type_name].get(name, None)
-                if match_entrypoint and return_entrypoint:
-                    raise ValueError('Multiple plugins with the same name but different types exist. '
-                                     'Must specify type_name.')
-                return_entrypoint = match_entrypoint
-                return_type = search_type_name
+        if type_name:
+            return self._entrypoints.get(type_name, {}).get(name, None), type_name
 
+        return_entrypoint, return_type = self._lookup(self._entrypoint_index, name)
         return return_entrypoint, return_type
 
-    def get_plugin_by_name(self, name, type_name=None, timeout=10):
+    def get_plugin_future(self, name, type_name=None):
         """
-        Find a collected plugin named `name`, optionally by also specifying the type of plugin.
+        Get a future for the plugin named `name`, optionally by also specifying the type of plugin.
+
+        If the plugin is still being collected, its loading is prioritized. Callers can block on the future's `result`
+        or attach a callback with `add_done_callback`; no polling is involved.
 
         Parameters
         ----------
@@ -365,58 +1014,132 @@ class XicamPluginManager():
 
         Returns
         -------
-        object
-            the matching plugin object (may be a class or instance), or None if not found
+        concurrent.futures.Future
+            a future resolving to the matching plugin object (may be a class or instance), or None if not found. If the
+            plugin fails to load or instantiate, the future holds the exception.
         """
         return_plugin = self._get_plugin_by_name(name, type_name)
 
-        if return_plugin:
-            return return_plugin
+        # The caller needs this plugin now; import it if it's still a lazy proxy
+        if isinstance(return_plugin, LazyPluginProxy):
+            return_plugin = return_plugin.resolve()
 
-        # If still actively collecting plugins
-        if self.state != State.READY:
-            # find the matching entrypoint
-            entrypoint, type_name = self._get_entrypoint_by_name(name, type_name)
+        # If collected already, or there is nothing left to wait for
+        if return_plugin or self.state == State.READY:
+            future = Future()
+            future.set_result(return_plugin)
+            return future
 
-            if not entrypoint:
-                raise NameError(f'The plugin named {name} of type {type_name} could not be discovered. '
-                                f'Check your installation integrity.')
+        # find the matching entrypoint
+        entrypoint, type_name = self._get_entrypoint_by_name(name, type_name)
 
-            # Load it immediately; it will move to top of instantiate queue as well
-            msg.logMessage(f"Immediately loading {entrypoint.name}.", level=msg.INFO)
-            self._load_plugin(type_name, entrypoint)
+        if not entrypoint:
+            raise NameError(f'The plugin named {name} of type {type_name} could not be discovered. '
+                            f'Check your installation integrity.')
 
+        # Listen before loading, so that the completion can't be missed
+        future = self._plugin_future(type_name, entrypoint.name)
+
+        # Load it immediately; it will move to top of instantiate queue as well
+        msg.logMessage(f"Immediately loading {entrypoint.name}.", level=msg.INFO)
+        self._load_plugin(type_name, entrypoint, priority=PROMOTED_PRIORITY)
+
+        if self.synchronous:
+            # It's at the top of the instantiate queue; instantiate it right away
+            while not future.done() and self._instantiate_next():
+                pass
+        else:
             # Add another instantiate event to the Qt event queue, so that it triggers in the next event loop
             threads.invoke_as_event(self._instantiate_plugin)
 
-            # wait for it to load
-            with load_timer() as elapsed:
-                while not return_plugin:
-                    return_plugin = self._get_plugin_by_name(name, type_name)
-                    if threads.is_main_thread():
-                        QApplication.processEvents()  #
-                    else:
-                        time.sleep(0.01)
-                    if elapsed() > timeout:
-                        raise TimeoutError(f"Plugin named {name} waited too long to instantiate and timed out")
+        return future
 
-        return return_plugin
+    def get_plugin_by_name(self, name, type_name=None, timeout=10):
+        """
+        Find a collected plugin named `name`, optionally by also specifying the type of plugin.
+
+        Parameters
+        ----------
+        name : str
+            name of the plugin to get
+        type_name : str
+            type of the plugin to get (optional)
+        timeout : float
+            seconds to wait for the plugin, if it is still being collected
+
+        Returns
+        -------
+        object
+            the matching plugin object (may be a class or instance), or None if not found
+
+        Raises
+        ------
+        ValueError
+            if `type_name` isn't given, and plugins of different types are named `name`
+        """
+        future = self.get_plugin_future(name, type_name)
+
+        if not future.done() and qt_is_safe and threads.is_main_thread():
+            # Instantiation happens in this thread's event loop; run a local loop until the plugin is ready
+            loop = QEventLoop()
+            future.add_done_callback(lambda _: threads.invoke_as_event(loop.quit))
+            QTimer.singleShot(int(timeout * 1000), loop.quit)
+            loop.exec_()
+            timeout = 0
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(f"Plugin named {name} waited too long to instantiate and timed out")
+
+    def get_plugin_by_class_name(self, class_name, type_name=None, timeout=10):
+        """
+        Find a collected plugin by the name of its class (rather than its entrypoint name), optionally by also
+        specifying the type of plugin.
+
+        The lookup is a single index access; no plugins are scanned or imported other than the match.
+
+        Parameters
+        ----------
+        class_name : str
+            ``__name__`` of the plugin's class
+        type_name : str
+            type of the plugin to get (optional)
+        timeout : float
+            seconds to wait for the plugin, if it is still being collected
+
+        Returns
+        -------
+        object
+            the matching plugin object (may be a class or instance), or None if not found
+        """
+        matches = [key for key in self._class_name_index.get(class_name, ()) if type_name in (None, key[0])]
+        if not matches:
+            return None
+        if len(matches) > 1:
+            raise ValueError(f'Multiple plugins with the class name {class_name} exist: {matches}. '
+                             f'Must specify type_name, or use get_plugin_by_name.')
+        match_type, name = matches[0]
+        return self.get_plugin_by_name(name, match_type, timeout=timeout)
 
     def get_plugins_of_type(self, type_name):
         return list(self.type_mapping[type_name].values())
 
     def attach(self, callback, filter=None):
         """
-        Subscribe a callback to receive notifications. If a filter is used, only matching notifications are sent.
-        See `Filters` for options.
+        Subscribe a callback to receive notifications. If a filter is used, only matching notifications are sent, along
+        with any payload for that filter (e.g. the reloaded plugins for `Filters.RELOAD`). See `Filters` for options.
 
         """
         self._observers.append((callback, filter))
 
-    def _notify(self, filter=None):
-        """ Notify all observers. Observers attached with filters much mach the emitted filter to be notified."""
+    def _notify(self, filter=None, *args):
+        """ Notify all observers. Observers attached with filters much mach the emitted filter to be notified.
+        Notifications with a payload (`args`) are only sent to observers attached to that filter."""
         for callback, obsfilter in self._observers:
-            if obsfilter == filter or not obsfilter:
+            if obsfilter == filter:
+                callback(*args)
+            elif not obsfilter and not args:
                 callback()
 
     def venvChanged(self):
@@ -462,6 +1185,64 @@ class LiveEntryPoint(entrypoints.EntryPoint):
         return self.object
 
 
+class LazyPluginProxy(object):
+    """
+    A stand-in for a discovered plugin whose module has not been imported yet.
+
+    The proxy exposes the plugin's name (including `PluginType.name()`), type, and entrypoint metadata. Accessing any
+    other attribute, or calling the proxy, imports and instantiates the real plugin through the manager; the proxy
+    then forwards to it.
+    """
+
+    def __init__(self, manager, type_name, entrypoint):
+        self._manager = manager
+        self._plugin = None
+        self._name = entrypoint.name
+        self.type_name = type_name
+        self.entrypoint = entrypoint
+
+    @property
+    def plugin_name(self):
+        return self.entrypoint.name
+
+    def name(self):
+        # PluginType.name (e.g. for menus), answered from the entrypoint without importing the plugin
+        return self.entrypoint.name
+
+    @property
+    def metadata(self):
+        distro = self.entrypoint.distro
+        return {'name': self.entrypoint.name,
+                'type_name': self.type_name,
+                'module_name': self.entrypoint.module_name,
+                'object_name': self.entrypoint.object_name,
+                'distribution': distro.name if distro else None,
+                'version': distro.version if distro else None}
+
+    @property
+    def is_resolved(self):
+        return self._plugin is not None
+
+    def resolve(self):
+        """ Import and instantiate the real plugin (if not already done) and return it."""
+        if self._plugin is None:
+            self._plugin = self._manager._resolve_proxy(self)
+        return self._plugin
+
+    def __getattr__(self, attr):
+        # Only reached for attributes not found on the proxy itself; don't import for protocol/introspection lookups
+        if attr.startswith('__') or attr in ('_manager', '_plugin', 'entrypoint'):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        state = 'resolved' if self.is_resolved else 'unresolved'
+        return f'<LazyPluginProxy {self.type_name}:{self.plugin_name} ({state})>'
+
+
 from ._version import get_versions
 
 __version__ = get_versions()["version"]
@@ -0,0 +1,115 @@
+"""
+Out-of-core execution of OperationPlugins.
+
+Operations that declare which of their inputs and outputs can be split along an axis (see
+`xicam.plugins.operationplugin.chunkable`) can be applied block by block with `apply_blockwise`. Inputs may be numpy
+arrays, memmaps or dask arrays; only one block of each is read into memory at a time, and outputs are written into
+preallocated stores (e.g. memmaps or zarr arrays), so peak memory is bounded by the block size rather than the size of
+the dataset.
+"""
+from typing import Callable, Dict, Union
+
+import numpy as np
+
+from .operationplugin import OperationPlugin
+
+
+def _nbytes_per_index(value, axis) -> int:
+    shape = np.shape(value)
+    itemsize = np.dtype(getattr(value, 'dtype', np.float64)).itemsize
+    return int(np.prod(shape, dtype=np.int64)) // max(shape[axis], 1) * itemsize
+
+
+def _block_index(ndim, axis, start, stop):
+    index = [slice(None)] * ndim
+    index[axis] = slice(start, stop)
+    return tuple(index)
+
+
+def block_slices(length: int, block_size: int):
+    """Yield (start, stop) bounds of consecutive blocks covering range(length)."""
+    for start in range(0, length, block_size):
+        yield start, min(start + block_size, length)
+
+
+def apply_blockwise(operation: OperationPlugin,
+                    out: Union[Dict[str, object], Callable] = None,
+                    block_size: int = None,
+                    block_bytes: int = 64 * 1024 ** 2,
+                    **kwargs) -> dict:
+    """Apply `operation` block by block along the axes declared with `chunkable`.
+
+    Inputs that are declared chunkable are sliced along their chunk axis; all other inputs are passed whole to each
+    call. Each block of each output is written into its store in `out`.
+
+    Parameters
+    ----------
+    operation : OperationPlugin
+        The operation instance to apply.
+    out : dict or callable, optional
+        Either a dict of output names to preallocated stores that support slice assignment (numpy memmaps, zarr
+        arrays, ...), or a callable `out(name, shape, dtype)` returning such a store, which is called with the full
+        shape of each output once the first block has been computed. By default, outputs are allocated in memory.
+    block_size : int, optional
+        The number of indices along the chunk axis in each block. By default, it is chosen such that each block of
+        the chunked inputs takes up to `block_bytes`.
+    block_bytes : int, optional
+        The approximate size of each block of the chunked inputs, if `block_size` is not given.
+    kwargs : keyword args
+        Inputs to the operation.
+
+    Returns
+    -------
+    outputs : dict
+        Keys are the operation's output names, values are the stores the outputs were written to.
+    """
+    chunk_axes = operation.chunk_axes
+    chunked = {name: value for name, value in kwargs.items() if name in chunk_axes}
+    if not chunked:
+        raise ValueError(f"None of the inputs given to {operation} are chunkable.")
+
+    output_names = operation._output_name_tuple()
+    missing = [name for name in output_names if name not in chunk_axes]
+    if missing:
+        raise ValueError(f"The outputs {missing} of {operation} are not chunkable.")
+
+    lengths = {np.shape(value)[chunk_axes[name]] for name, value in chunked.items()}
+    if len(lengths) > 1:
+        raise ValueError(f"Chunked inputs to {operation} have different lengths along their chunk axes: "
+                         f"{sorted(lengths)}.")
+    length = lengths.pop()
+
+    if block_size is None:
+        nbytes_per_index = sum(_nbytes_per_index(value, chunk_axes[name]) for name, value in chunked.items())
+        block_size = max(1, block_bytes // max(nbytes_per_index, 1))
+
+    stores = out if isinstance(out, dict) else {}
+    allocate = out if callable(out) else (lambda name, shape, dtype: np.empty(shape, dtype=dtype))
+
+    if not length:
+        # There are no blocks to shape the outputs; infer them from the (empty) inputs instead
+        for name, spec in operation.infer_outputs(**kwargs).items():
+            if name not in stores:
+                stores[name] = allocate(name, spec.shape, spec.dtype)
+
+    for start, stop in block_slices(length, block_size):
+        block_kwargs = dict(kwargs)
+        for name, value in chunked.items():
+            # np.asarray reads a memmap block into memory, or computes a dask block
+            block_kwargs[name] = np.asarray(value[_block_index(np.ndim(value), chunk_axes[name], start, stop)])
+
+        results = operation._map_outputs(operation(**block_kwargs))
+
+        for name in output_names:
+            block = np.asarray(results[name])
+            axis = chunk_axes[name] % block.ndim
+            if name not in stores:
+                shape = block.shape[:axis] + (length,) + block.shape[axis + 1:]
+                stores[name] = allocate(name, shape, block.dtype)
+            stores[name][_block_index(block.ndim, axis, start, stop)] = block
+
+    for store in stores.values():
+        if hasattr(store, 'flush'):
+            store.flush()
+
+    return {name: stores[name] for name in output_names}
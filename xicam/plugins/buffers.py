@@ -0,0 +1,50 @@
+"""
+Reusable output buffers for OperationPlugins.
+
+Operations that accept caller-provided output buffers (see `xicam.plugins.operationplugin.output_buffer`) can be
+called with `OperationPlugin.call_with_buffers`, which takes their outputs' buffers from a `BufferPool`. Once the
+pool is warm, steady-state processing makes no new large allocations.
+"""
+import threading
+from typing import Callable
+
+import numpy as np
+
+
+class BufferPool(object):
+    """
+    A ring of `depth` buffers for each output name, shape and dtype.
+
+    A buffer is handed out again `depth` calls after it was last handed out, so a consumer may hold on to up to
+    `depth - 1` previous results while the next one is computed; copy results that need to live longer.
+    """
+
+    def __init__(self, depth: int = 2, allocate: Callable = np.empty):
+        self.depth = depth
+        self.allocate = allocate
+        self._rings = {}  # (name, shape, dtype) -> [buffers, next index]
+        self._lock = threading.Lock()
+        self.allocations = 0
+
+    def get(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        key = (name, tuple(shape), np.dtype(dtype))
+        with self._lock:
+            ring = self._rings.setdefault(key, [[], 0])
+            buffers, index = ring
+            if len(buffers) < self.depth:
+                buffer = self.allocate(key[1], key[2])
+                buffers.append(buffer)
+                self.allocations += 1
+            else:
+                buffer = buffers[index]
+            ring[1] = (index + 1) % self.depth
+            return buffer
+
+    def clear(self):
+        with self._lock:
+            self._rings.clear()
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(buffer.nbytes for buffers, _ in self._rings.values() for buffer in buffers)
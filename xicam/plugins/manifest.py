@@ -0,0 +1,166 @@
+"""
+Persistent on-disk cache of discovered plugin entrypoints.
+
+Querying an entrypoint group scans the metadata of every distribution on sys.path. The manifest stores the result of
+those scans under the user cache dir, keyed on a fingerprint of the environment (sys.path and the mtimes of installed
+distributions' metadata), so that a warm start can skip the scan entirely. Installing or removing a package changes
+the fingerprint, which invalidates the manifest.
+"""
+import hashlib
+import json
+import os
+import sys
+
+import entrypoints
+from appdirs import user_cache_dir
+
+from xicam.core import msg
+
+manifest_path = os.path.join(user_cache_dir(appname="xicam"), "plugin_manifest.json")
+
+_distribution_suffixes = ('.dist-info', '.egg-info', '.egg', '.egg-link')
+
+
+def environment_fingerprint(path=None) -> str:
+    """
+    Hash sys.path (or `path`) and the metadata mtimes of all distributions found on it.
+
+    Only cheap `stat` calls are made; no metadata is parsed.
+    """
+    hasher = hashlib.sha1()
+    for entry in (sys.path if path is None else path):
+        hasher.update(entry.encode('utf-8', 'surrogateescape') + b'\0')
+        try:
+            stat = os.stat(entry or '.')
+        except OSError:
+            continue
+        # The directory mtime changes whenever a distribution is added to or removed from it
+        hasher.update(str(stat.st_mtime_ns).encode())
+        if not os.path.isdir(entry or '.'):
+            continue
+
+        try:
+            dir_entries = sorted(os.scandir(entry or '.'), key=lambda dir_entry: dir_entry.name)
+        except OSError:
+            continue
+
+        for dir_entry in dir_entries:
+            if not dir_entry.name.endswith(_distribution_suffixes):
+                continue
+            metadata_path = dir_entry.path
+            if dir_entry.is_dir():
+                # editable installs may rewrite entry_points.txt in place without touching the directory
+                metadata_path = os.path.join(metadata_path, 'entry_points.txt')
+            try:
+                mtime = os.stat(metadata_path).st_mtime_ns
+            except OSError:
+                mtime = 0
+            hasher.update(f'{dir_entry.name}:{mtime}'.encode('utf-8', 'surrogateescape'))
+
+    return hasher.hexdigest()
+
+
+def _serialize_entrypoint(entrypoint: entrypoints.EntryPoint) -> dict:
+    distro = entrypoint.distro
+    return {'name': entrypoint.name,
+            'module_name': entrypoint.module_name,
+            'object_name': entrypoint.object_name,
+            'extras': entrypoint.extras,
+            'distro': [distro.name, distro.version] if distro else None}
+
+
+def _deserialize_entrypoint(data: dict) -> entrypoints.EntryPoint:
+    distro = entrypoints.Distribution(*data['distro']) if data.get('distro') else None
+    return entrypoints.EntryPoint(data['name'],
+                                  data['module_name'],
+                                  data['object_name'],
+                                  extras=data.get('extras'),
+                                  distro=distro)
+
+
+class EntrypointManifest(object):
+    """
+    A cache of entrypoint groups, persisted as json at `path`.
+
+    Call `refresh` before a discovery cycle to (re)validate the cache against the current environment, `get_group` to
+    query a group, and `save` afterwards to persist any groups that had to be scanned.
+    """
+
+    def __init__(self, path=manifest_path):
+        self.path = path
+        self.fingerprint = None
+        self._groups = {}
+        self._dirty = False
+
+    def refresh(self):
+        """ Recompute the environment fingerprint, and load the on-disk manifest if it is still valid."""
+        fingerprint = environment_fingerprint()
+        if fingerprint == self.fingerprint:
+            return
+
+        self.fingerprint = fingerprint
+        self._groups = {}
+        self._dirty = False
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            msg.logMessage(f'Unable to read plugin manifest at {self.path}; it will be rebuilt.', level=msg.WARNING)
+            msg.logError(ex)
+            return
+
+        if data.get('fingerprint') == fingerprint:
+            self._groups = data.get('groups', {})
+            msg.logMessage(f'Using cached plugin manifest from {self.path}')
+        else:
+            msg.logMessage('Installed packages have changed; the plugin manifest will be rebuilt.')
+
+    def get_group(self, group: str):
+        """
+        Return the entrypoints in `group`, as a tuple of (dict of winning entrypoints by name, list of all entrypoints)
+
+        This mirrors `entrypoints.get_group_named` and `entrypoints.get_group_all`.
+        """
+        if self.fingerprint is None:
+            self.refresh()
+
+        if group not in self._groups:
+            self._groups[group] = [_serialize_entrypoint(entrypoint) for entrypoint in entrypoints.get_group_all(group)]
+            self._dirty = True
+
+        group_all = list(map(_deserialize_entrypoint, self._groups[group]))
+        group_named = {}
+        for entrypoint in group_all:
+            # the first entrypoint found on sys.path wins, as with entrypoints.get_group_named
+            group_named.setdefault(entrypoint.name, entrypoint)
+        return group_named, group_all
+
+    def save(self):
+        """ Write the manifest to disk, if any groups were scanned since it was loaded."""
+        if not self._dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump({'fingerprint': self.fingerprint, 'groups': self._groups}, f)
+            os.replace(temp_path, self.path)  # atomic, in case several Xi-cam processes start at once
+        except OSError as ex:
+            msg.logMessage(f'Unable to write plugin manifest to {self.path}.', level=msg.WARNING)
+            msg.logError(ex)
+        else:
+            self._dirty = False
+
+    def clear(self):
+        """ Forget all cached groups and remove the on-disk manifest."""
+        self.fingerprint = None
+        self._groups = {}
+        self._dirty = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,179 @@
+"""
+Memoization of OperationPlugin results.
+
+Operations that opt in (see `xicam.plugins.operationplugin.cache_results`) have their results stored in the global
+`result_cache`, keyed on the operation's function and a content hash of its filled kwargs. Arrays are hashed through
+their buffers rather than pickled, so keying even large frames is cheap. The cache tracks the size of what it holds
+and evicts the least recently used results once its memory budget is exceeded.
+"""
+import hashlib
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+
+class UnhashableInput(TypeError):
+    """Raised when an input can't be hashed; the call then bypasses the cache."""
+    pass
+
+
+def _update_hash(hasher, value):
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        hasher.update(b'ndarray')
+        hasher.update(f'{value.dtype.str}{value.shape}'.encode())
+        # Hashed as raw bytes, as buffers of some dtypes (e.g. datetime64) can't be exported
+        hasher.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif value is None or isinstance(value, (bool, int, float, complex, str, np.generic)):
+        hasher.update(f'{type(value).__name__}:{value!r}'.encode())
+    elif isinstance(value, bytes):
+        hasher.update(b'bytes')
+        hasher.update(value)
+    elif isinstance(value, (tuple, list)):
+        hasher.update(f'{type(value).__name__}[{len(value)}]'.encode())
+        for item in value:
+            _update_hash(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f'dict[{len(value)}]'.encode())
+        for key in sorted(value, key=repr):
+            _update_hash(hasher, key)
+            _update_hash(hasher, value[key])
+    else:
+        try:
+            hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as ex:
+            raise UnhashableInput(f'Unable to hash input of type {type(value)}') from ex
+
+
+def hash_kwargs(kwargs: dict) -> bytes:
+    """Return a content hash of a dict of kwargs."""
+    hasher = hashlib.blake2b(digest_size=16)
+    _update_hash(hasher, kwargs)
+    return hasher.digest()
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(map(_nbytes, value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(key) + _nbytes(item) for key, item in value.items())
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    # Cached arrays are shared between callers; make accidental in-place modification raise rather than corrupt. Only
+    # read-only views are handed out, as the result may be an array the caller still holds (e.g. one of its inputs).
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, list):
+        return list(map(_freeze, value))
+    if isinstance(value, tuple):
+        frozen = map(_freeze, value)
+        return type(value)(*frozen) if hasattr(value, '_fields') else tuple(frozen)
+    return value
+
+
+class ResultCache(object):
+    """
+    A thread-safe LRU cache of operation results, bounded by `max_bytes`.
+
+    Results are shared between callers and arrays are returned read-only; copy a result before modifying it.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (func, digest) -> (result, nbytes)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def call(self, func: Callable, kwargs: dict):
+        """Return `func(**kwargs)`, from the cache if it was computed before with the same kwargs."""
+        key, entry = self._lookup(func, kwargs)
+        if entry is not None:
+            return entry[0]
+        return self._keep(key, func(**kwargs))
+
+    async def acall(self, func: Callable, kwargs: dict):
+        """Await `func(**kwargs)` for a coroutine function `func`, from the cache if it was computed before."""
+        key, entry = self._lookup(func, kwargs)
+        if entry is not None:
+            return entry[0]
+        return self._keep(key, await func(**kwargs))
+
+    def _lookup(self, func, kwargs):
+        # Returns the key of the call (None if its kwargs can't be hashed) and its cache entry (None on a miss)
+        try:
+            key = (func, hash_kwargs(kwargs))
+        except UnhashableInput:
+            key = None
+
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        return key, entry
+
+    def _keep(self, key, result):
+        if key is None:
+            return result
+        result = _freeze(result)
+        self._store(key, result)
+        return result
+
+    def _store(self, key, result):
+        nbytes = _nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (result, nbytes)
+            self.bytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.bytes -= nbytes
+
+    def resize(self, max_bytes: int):
+        """Change the memory budget, evicting results as needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'entries': len(self._entries),
+                    'bytes': self.bytes,
+                    'max_bytes': self.max_bytes}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The cache shared by all operations, so that they are bounded by a single memory budget
+result_cache = ResultCache()
@@ -1,11 +1,19 @@
 """TODO Module docstring"""
+import asyncio
+import functools
 import inspect
-from typing import Collection, Tuple, Type, Union, List, Callable, Sequence
+from typing import Collection, Tuple, Type, Union, List, Callable, Sequence, Iterator
 from collections import namedtuple, OrderedDict
 
+import numpy as np
+
 from xicam.core import msg
 
 from .hints import PlotHint
+from .buffers import BufferPool
+from .operationcache import result_cache
+from .parallel import parallel_map
+from .streaming import BoundedIterator
 
 
 class OperationError(Exception):
@@ -36,6 +44,40 @@ class ValidationError(OperationError):
         return f"Validation failed for {self.operation}: {self.message}"
 
 
+# Parsed signature of an operation's function; defaults and annotations are aligned with parameter_names, and use
+# inspect.Parameter.empty where absent
+OperationSignature = namedtuple('OperationSignature',
+                                ['parameter_names', 'defaults', 'annotations', 'return_annotation'])
+
+
+def _parse_signature(func: Callable) -> OperationSignature:
+    signature = inspect.signature(func)
+    parameters = tuple(signature.parameters.values())
+    return OperationSignature(tuple(parameter.name for parameter in parameters),
+                              tuple(parameter.default for parameter in parameters),
+                              tuple(parameter.annotation for parameter in parameters),
+                              signature.return_annotation)
+
+
+# The shape and dtype of an array, e.g. an input or output of an operation whose values are not known yet
+ArraySpec = namedtuple('ArraySpec', ['shape', 'dtype'])
+
+
+class _FunctionKind(object):
+    """
+    A read-only flag derived from an operation's function, on both operation classes and instances.
+
+    Being derived rather than stored, it also holds for operations restored from a pickle (see
+    `OperationPlugin.__reduce__`).
+    """
+
+    def __init__(self, predicate: Callable):
+        self.predicate = predicate
+
+    def __get__(self, instance, owner):
+        return self.predicate((owner if instance is None else instance)._func)
+
+
 # TODO: Remove all args from OperationPlugin
 
 
@@ -77,7 +119,10 @@ class OperationPlugin:
         Names (in order) of the output(s) for the operation.
     output_shape : dict
         Keys are the output parameter names, values are the expected shape of the output
-        (which are of type list).
+        (which are of type list), or rules computing it from the inputs (see `infer_outputs`).
+    output_dtype : dict
+        Keys are the output parameter names, values are the expected dtype of the output,
+        or rules computing it from the inputs (see `infer_outputs`).
     units : dict
         Keys are the parameter names, values are units (of type str).
     visible : dict
@@ -92,6 +137,31 @@ class OperationPlugin:
         A mapping dict containing descriptions of each named input parameter
     output_descriptions : dict
         A mapping dict containing descriptions of each named output parameter
+    vectorizable : bool
+        Whether the operation accepts a whole batch of inputs stacked along `batch_axis` in one call
+        (default is False; see `batch_call`).
+    batch_axis : int
+        The axis along which batched inputs and outputs are stacked (default is 0).
+    cache_results : bool
+        Whether results are memoized in `xicam.plugins.operationcache.result_cache` (default is False).
+    chunk_axes : dict
+        Keys are input and output names, values are the axis along which the operation can be applied block by
+        block (see `xicam.plugins.blockwise.apply_blockwise`).
+    streaming : bool
+        Whether the operation's function is a generator, which receives iterators for its `stream_inputs` and yields
+        its outputs incrementally (see `stream`).
+    stream_inputs : Tuple[str, ...]
+        Names of the inputs that receive streams when the operation is streamed (defaults to the first input).
+    max_pending : int
+        The number of items of each input stream that may be buffered ahead of the operation (default is 0: streams
+        are pulled lazily, one item at a time).
+    asynchronous : bool
+        Whether the operation's function is a coroutine function (`async def`); see `acall`.
+    output_buffers : dict
+        Keys are output names, values are the names of the parameters through which the operation accepts
+        caller-provided buffers for those outputs (see `call_with_buffers`).
+    buffer_pool : BufferPool
+        The pool of output buffers used by `call_with_buffers` (created on first use).
 
     See Also
     --------
@@ -113,6 +183,7 @@ class OperationPlugin:
     needs_qt = False
 
     _func = None  # type: Callable
+    _signature = None  # type: OperationSignature
     filled_values = {}  # type: dict
     fixable = {}  # type: dict
     fixed = {}  # type: dict
@@ -121,6 +192,7 @@ class OperationPlugin:
     limits = {}  # type: dict
     opts = {}  # type: dict
     output_shape = {}  # type: dict
+    output_dtype = {}  # type: dict
     units = {}  # type: dict
     visible = {}  # type: dict
     name = None  # type: str
@@ -128,6 +200,15 @@ class OperationPlugin:
     output_descriptions = {}  # type: dict
     categories = None  # type: Sequence[Union[tuple, str]]
     hints = []
+    vectorizable = False  # type: bool
+    batch_axis = 0  # type: int
+    cache_results = False  # type: bool
+    chunk_axes = {}  # type: dict
+    streaming = _FunctionKind(inspect.isgeneratorfunction)  # type: bool
+    stream_inputs = ()  # type: Tuple[str]
+    max_pending = 0  # type: int
+    asynchronous = _FunctionKind(inspect.iscoroutinefunction)  # type: bool
+    output_buffers = {}  # type: dict
 
     def __init__(self):
         super(OperationPlugin, self).__init__()
@@ -138,6 +219,7 @@ class OperationPlugin:
         self.limits = self.limits.copy()
         self.opts = self.opts.copy()
         self.output_shape = self.output_shape.copy()
+        self.output_dtype = self.output_dtype.copy()
         self.units = self.units.copy()
         self.hints = self.hints.copy()
 
@@ -162,7 +244,8 @@ class OperationPlugin:
 
         # Check if there is a 1:1 mapping from user-specified input_names to function args
         num_names = len(cls.input_names)
-        num_args = len(inspect.signature(cls._func).parameters.keys())
+        signature = vars(cls).get('_signature') or _parse_signature(cls._func)
+        num_args = len(signature.parameter_names)
         if num_names != num_args:
             invalid_msg += (f"Number of input_names given ({num_names}) "
                             f"must match number of inputs for the operation ({num_args}).")
@@ -183,7 +266,24 @@ class OperationPlugin:
             msg.logMessage(warning_msg, level=msg.WARNING)
 
         # Define which "output" arg properties we want to check
-        output_properties = {"output_shape": cls.output_shape}
+        output_properties = {"output_shape": cls.output_shape,
+                             "output_dtype": cls.output_dtype,
+                             "output_buffers": cls.output_buffers}
+        # Check that output buffers are passed through arguments of the operation
+        for arg, parameter_name in cls.output_buffers.items():
+            if parameter_name not in signature.parameter_names:
+                invalid_msg += f"\"{parameter_name}\" is not a valid input for \"output_buffers\". "
+
+        # Check that stream inputs are actually arguments of the operation
+        for arg in cls.stream_inputs:
+            if arg not in signature.parameter_names:
+                invalid_msg += f"\"{arg}\" is not a valid input for \"stream_inputs\". "
+
+        # Chunk axes may refer to either inputs or outputs
+        output_names = (cls.output_names,) if isinstance(cls.output_names, str) else tuple(cls.output_names or ())
+        for arg in cls.chunk_axes.keys():
+            if arg not in cls.input_names and arg not in output_names:
+                invalid_msg += f"\"{arg}\" is not a valid input or output for \"chunk_axes\". "
         # Check if there are any output args that are not actually defined in the operation
         for name, prop in output_properties.items():
             for arg in prop.keys():
@@ -197,24 +297,378 @@ class OperationPlugin:
 
     def __call__(self, **kwargs):
         """Allows this class to be used as a function decorator."""
+        if self.asynchronous:
+            # Synchronous callers of async operations run them to completion on a private event loop
+            return _run_until_complete(self.acall(**kwargs))
+
         filled_kwargs = self.filled_values.copy()
         filled_kwargs.update(kwargs)
+        if self.cache_results:
+            return result_cache.call(self._func, filled_kwargs)
         return self._func(**filled_kwargs)
 
+    async def acall(self, **kwargs):
+        """Call the operation from a coroutine.
+
+        Asynchronous operations (`async def` functions) are awaited directly, so that many of them can run
+        concurrently on one event loop. Synchronous operations are run in the event loop's default executor, so that
+        they don't block the loop.
+
+        Examples
+        --------
+        Fetch several calibration files concurrently.
+
+        >>>@operation\
+        @output_names('calibration')\
+        async def fetch_calibration(url: str) -> dict:\
+            ...\
+        \
+        calibrations = await asyncio.gather(*(fetch_calibration().acall(url=url) for url in urls))
+        """
+        if not self.asynchronous:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, functools.partial(self.__call__, **kwargs))
+
+        filled_kwargs = self.filled_values.copy()
+        filled_kwargs.update(kwargs)
+        if self.cache_results:
+            return await result_cache.acall(self._func, filled_kwargs)
+        return await self._func(**filled_kwargs)
+
+    def batch_call(self, batched: Union[dict, Sequence[dict]], batch_axis: int = None, **kwargs) -> dict:
+        """Call the operation over a batch of inputs, returning its outputs stacked along the batch axis.
+
+        Vectorizable operations (see `vectorizable`) receive the whole stack in a single call; other operations
+        are called once per item of the batch.
+
+        Parameters
+        ----------
+        batched : dict or sequence of dicts
+            Either a dict of input names to arrays stacked along the batch axis,
+            or a sequence of kwarg dicts (one per item in the batch).
+        batch_axis : int, optional
+            The axis along which inputs and outputs are stacked (defaults to the operation's `batch_axis`).
+        kwargs : keyword args
+            Inputs shared by all items in the batch.
+
+        Returns
+        -------
+        outputs : dict
+            Keys are the operation's output names, values are the outputs stacked along the batch axis.
+
+        Examples
+        --------
+        >>>@operation\
+        @output_names('square')\
+        def square(n: int = 2) -> int:\
+            return n**2\
+        \
+        square().batch_call({'n': np.arange(10)})
+        {'square': array([ 0,  1,  4,  9, 16, 25, 36, 49, 64, 81])}
+        """
+        if batch_axis is None:
+            batch_axis = self.batch_axis
+
+        if isinstance(batched, dict):
+            stacked = batched
+            lengths = {np.shape(value)[batch_axis] for value in stacked.values()}
+            if len(lengths) > 1:
+                raise ValueError(f"Batched inputs to {self} have different lengths along axis {batch_axis}: "
+                                 f"{sorted(lengths)}.")
+            length = lengths.pop() if lengths else 0
+        else:
+            batched = list(batched)
+            stacked = None
+            length = len(batched)
+
+        # Output shapes can't be known without a call; vectorizable operations are still called with empty stacks
+        if not length and (stacked is None or not self.vectorizable):
+            raise ValueError(f"Can't call {self} over an empty batch.")
+
+        if self.vectorizable:
+            if stacked is None:
+                names = batched[0].keys() if batched else ()
+                stacked = {name: np.stack([item[name] for item in batched], axis=batch_axis) for name in names}
+            return self._map_outputs(self(**stacked, **kwargs))
+
+        if stacked is not None:
+            # Index views out of the stacks rather than copying each item
+            stacked = {name: np.moveaxis(np.asarray(value), batch_axis, 0) for name, value in stacked.items()}
+            batched = [{name: value[i] for name, value in stacked.items()} for i in range(length)]
+
+        results = [self._map_outputs(self(**item, **kwargs)) for item in batched]
+        return {name: np.stack([result[name] for result in results], axis=batch_axis)
+                for name in self._output_name_tuple()}
+
+    def stream(self, **kwargs) -> Iterator:
+        """Stream inputs through the operation, lazily yielding its outputs.
+
+        The operation's `stream_inputs` are given iterables; all other inputs are fixed for the whole stream.
+        Streaming operations (generator functions) receive the streams themselves and yield outputs as they see fit;
+        other operations are called once per item (zipping the items of multiple streams).
+
+        If `max_pending` is set, each input stream is consumed in a background thread, buffering up to `max_pending`
+        items; a producer that gets further ahead of the operation than that is blocked.
+
+        Examples
+        --------
+        Keep a running average of a live stream of frames.
+
+        >>>@operation\
+        @output_names('average')\
+        @streaming('frames', max_pending=8)\
+        def running_average(frames: Iterator[np.ndarray], weight: float = .1) -> np.ndarray:\
+            average = next(frames).astype(float)\
+            yield average\
+            for frame in frames:\
+                average += weight * (frame - average)\
+                yield average\
+        \
+        for average in running_average().stream(frames=detector_frames):\
+            display(average)
+        """
+        filled_kwargs = self.filled_values.copy()
+        filled_kwargs.update(kwargs)
+
+        # Checked here rather than in the generator, so that bad streams raise at the call site
+        streams = OrderedDict()
+        for name in self._stream_input_names():
+            if name not in filled_kwargs:
+                raise TypeError(f"No stream was given for the stream input \"{name}\" of {self}.")
+            stream = filled_kwargs.pop(name)
+            try:
+                streams[name] = iter(stream)
+            except TypeError as ex:
+                raise TypeError(f"The stream input \"{name}\" of {self} must be iterable, "
+                                f"not {type(stream).__name__}.") from ex
+        return self._stream(filled_kwargs, streams)
+
+    def _stream(self, filled_kwargs: dict, streams: 'OrderedDict[str, Iterator]') -> Iterator:
+        if self.max_pending:
+            # Producer threads are only started once the stream is iterated
+            streams = OrderedDict((name, BoundedIterator(stream, self.max_pending)) for name, stream in streams.items())
+
+        try:
+            if self.streaming:
+                yield from self._func(**filled_kwargs, **streams)
+            else:
+                for items in zip(*streams.values()):
+                    yield self(**filled_kwargs, **dict(zip(streams.keys(), items)))
+        finally:
+            for stream in streams.values():
+                if isinstance(stream, BoundedIterator):
+                    stream.close()
+
+    def _stream_input_names(self) -> Tuple[str, ...]:
+        return tuple(self.stream_inputs) or self._get_signature().parameter_names[:1]
+
+    def map(self, batched: Union[dict, Sequence[dict]], processes: int = None, batch_axis: int = None,
+            shared_threshold: int = 1024 ** 2, chunksize: int = 1, start_method: str = None, **kwargs) -> dict:
+        """Call the operation once per item of a batch, across a pool of worker processes.
+
+        Like `batch_call`, but each call runs in a worker process. Arrays of at least `shared_threshold` bytes are
+        passed to and from the workers through shared memory rather than being pickled (with python 3.8+); a stack
+        of inputs is copied into shared memory once, and every call indexes its item out of it.
+
+        The operation's function must be importable by the workers: defined at the top level of a module, and not
+        shadowed there by its operation class.
+
+        Parameters
+        ----------
+        batched : dict or sequence of dicts
+            Either a dict of input names to arrays stacked along the batch axis,
+            or a sequence of kwarg dicts (one per call).
+        processes : int, optional
+            The number of worker processes (defaults to the number of CPUs).
+        batch_axis : int, optional
+            The axis along which inputs and outputs are stacked (defaults to the operation's `batch_axis`).
+        shared_threshold : int, optional
+            The size in bytes from which arrays are passed through shared memory (default is 1 MiB).
+        chunksize : int, optional
+            The number of calls sent to a worker at once.
+        start_method : str, optional
+            The multiprocessing start method of the workers ('fork', 'spawn' or 'forkserver'; defaults to the
+            platform's default).
+        kwargs : keyword args
+            Inputs shared by all calls; large arrays are copied into shared memory once.
+
+        Returns
+        -------
+        outputs : dict
+            Keys are the operation's output names, values are the outputs stacked along the batch axis.
+        """
+        return parallel_map(self, batched, processes=processes, batch_axis=batch_axis,
+                            shared_threshold=shared_threshold, chunksize=chunksize, start_method=start_method, **kwargs)
+
+    def infer_outputs(self, **inputs) -> 'OrderedDict[str, ArraySpec]':
+        """Infer the shapes and dtypes of the operation's outputs from the shapes and dtypes of its inputs.
+
+        Inputs may be given as arrays, or as `ArraySpec`s describing arrays; other values are passed as they are.
+        Missing inputs are taken from `filled_values`.
+
+        Outputs whose shape and dtype are both declared (see `output_shape` and `output_dtype`) are inferred from
+        those declarations; rules are called with the input specs as keyword arguments, and nothing is computed.
+        Otherwise, the operation is dry run on read-only proxies of its array inputs, which are broadcast from a
+        single element and take up no memory. The dry run still computes (and allocates) full-size outputs, so it
+        costs about as much as a real call; declare the outputs of expensive operations. Operations that modify their
+        inputs in place, and asynchronous and streaming operations, can't be dry run, and must declare their outputs.
+
+        Returns
+        -------
+        outputs : OrderedDict
+            Keys are the operation's output names, values are `ArraySpec`s of the outputs.
+
+        Examples
+        --------
+        >>>@operation\
+        @output_names('binned')\
+        @output_shape('binned', lambda image: (image.shape[0] // 2, image.shape[1] // 2))\
+        @output_dtype('binned', lambda image: image.dtype)\
+        def bin2x2(image: np.ndarray) -> np.ndarray:\
+            ...\
+        \
+        bin2x2().infer_outputs(image=ArraySpec((2048, 2048), np.uint16))
+        OrderedDict([('binned', ArraySpec(shape=(1024, 1024), dtype=dtype('uint16')))])
+        """
+        filled_kwargs = self.filled_values.copy()
+        filled_kwargs.update(inputs)
+
+        specs = {}
+        proxies = {}
+        for name, value in filled_kwargs.items():
+            if isinstance(value, np.ndarray):
+                specs[name] = ArraySpec(value.shape, value.dtype)
+            elif isinstance(value, ArraySpec):
+                specs[name] = ArraySpec(_as_shape(value.shape), np.dtype(value.dtype))
+            else:
+                proxies[name] = value
+                continue
+            proxies[name] = np.broadcast_to(np.zeros((), dtype=specs[name].dtype), specs[name].shape)
+
+        names = self._output_name_tuple()
+        if all(name in self.output_shape and name in self.output_dtype for name in names):
+            def apply_rule(rule):
+                return rule(**specs) if callable(rule) else rule
+
+            return OrderedDict((name, ArraySpec(_as_shape(apply_rule(self.output_shape[name])),
+                                                np.dtype(apply_rule(self.output_dtype[name]))))
+                               for name in names)
+
+        if self.asynchronous or self.streaming:
+            raise OperationError(f"{self} is {'asynchronous' if self.asynchronous else 'streaming'}, so it can't be "
+                                 f"dry run to infer its outputs; declare them with output_shape and output_dtype.")
+
+        try:
+            results = self._map_outputs(self._func(**proxies))
+        except Exception as ex:
+            raise OperationError(f"Unable to dry run {self} to infer its outputs; declare them with output_shape "
+                                 f"and output_dtype instead.") from ex
+
+        outputs = OrderedDict()
+        for name in names:
+            result = np.asarray(results[name])
+            outputs[name] = ArraySpec(result.shape, result.dtype)
+        return outputs
+
+    def allocate_outputs(self, allocate: Callable = np.empty, **inputs) -> dict:
+        """Allocate a buffer for each of the operation's outputs, as inferred by `infer_outputs`.
+
+        `allocate(shape, dtype)` creates each buffer (default is `np.empty`).
+        """
+        return {name: allocate(spec.shape, spec.dtype) for name, spec in self.infer_outputs(**inputs).items()}
+
+    def call_with_buffers(self, **kwargs):
+        """Call the operation, passing it output buffers taken from `buffer_pool`.
+
+        Only the outputs declared with `output_buffer` receive buffers. Their shapes and dtypes are inferred once per
+        combination of input shapes and dtypes (see `infer_outputs`), for the most recent few combinations; the values
+        of non-array inputs are assumed not to change them. After that, calls with inputs of the same shapes reuse the
+        pool's buffers instead of allocating new ones. A buffer is reused `buffer_pool.depth` calls later, so
+        copy any result that needs to outlive that.
+
+        Examples
+        --------
+        >>>@operation\
+        @output_names('corrected')\
+        @output_buffer('corrected', 'out')\
+        def subtract_dark(frame: np.ndarray, dark: np.ndarray, out: np.ndarray = None) -> np.ndarray:\
+            return np.subtract(frame, dark, out=out)\
+        \
+        op = subtract_dark()\
+        for frame in detector_frames:\
+            display(op.call_with_buffers(frame=frame, dark=dark))
+        """
+        specs = self._output_specs_for(kwargs)
+        for output_name, parameter_name in self.output_buffers.items():
+            spec = specs[output_name]
+            kwargs[parameter_name] = self.buffer_pool.get(output_name, spec.shape, spec.dtype)
+        return self(**kwargs)
+
+    @property
+    def buffer_pool(self) -> BufferPool:
+        # Created on first use, so that operations without output buffers don't pay for a pool
+        pool = self.__dict__.get('_buffer_pool')
+        if pool is None:
+            pool = self.__dict__.setdefault('_buffer_pool', BufferPool())
+        return pool
+
+    def _output_specs_for(self, kwargs) -> 'OrderedDict[str, ArraySpec]':
+        # LRU of input shapes and dtypes -> output specs; created on first use, like buffer_pool
+        output_specs = self.__dict__.get('_output_specs')
+        if output_specs is None:
+            output_specs = self.__dict__.setdefault('_output_specs', OrderedDict())
+        filled_kwargs = self.filled_values.copy()
+        filled_kwargs.update(kwargs)
+        # Keyed on the shapes and dtypes of array inputs, and only the types of other inputs, so that e.g. a
+        # per-frame scalar parameter doesn't cost a dry run per value
+        key = tuple((name, value.shape, value.dtype) if isinstance(value, np.ndarray) else (name, type(value))
+                    for name, value in sorted(filled_kwargs.items()))
+        specs = output_specs.get(key)
+        if specs is None:
+            specs = output_specs[key] = self.infer_outputs(**kwargs)
+            if len(output_specs) > _OUTPUT_SPECS_SIZE:
+                output_specs.popitem(last=False)
+        else:
+            output_specs.move_to_end(key)
+        return specs
+
+    def _output_name_tuple(self) -> Tuple[str, ...]:
+        # output_names falls back to the function's name (a str) when not declared
+        if isinstance(self.output_names, str):
+            return (self.output_names,)
+        return tuple(self.output_names or ())
+
+    def _map_outputs(self, result) -> dict:
+        """Maps the value returned by the operation's function to its output names."""
+        names = self._output_name_tuple()
+        if len(names) == 1:
+            return {names[0]: result}
+        return dict(zip(names, result))
+
     def __str__(self):
         return f"OperationPlugin named {self.name}"
 
+    def _get_signature(self) -> OperationSignature:
+        """Returns the parsed signature of the operation's function, parsing it only once per class."""
+        # Instances restored from a pickle (see __reduce__) carry their own _func
+        owner = self if '_func' in self.__dict__ else type(self)
+        signature = vars(owner).get('_signature')
+        if signature is None:
+            signature = _parse_signature(self._func)
+            setattr(owner, '_signature', signature)
+        return signature
+
     @property
     def input_types(self) -> 'OrderedDict[str, Type]':
         """Returns the types of the inputs for the operation."""
-        signature = inspect.signature(self._func)
-        input_type_map = OrderedDict([(name, parameter.annotation) for name, parameter in signature.parameters.items()])
+        signature = self._get_signature()
+        input_type_map = OrderedDict(zip(signature.parameter_names, signature.annotations))
         return input_type_map
 
     @property
     def output_types(self) -> 'OrderedDict[str, Type]':
         """Returns the types of the outputs for the operation."""
-        return_annotation = inspect.signature(self._func).return_annotation
+        return_annotation = self._get_signature().return_annotation
         if not return_annotation or return_annotation is inspect.Signature.empty:
             return_annotation = tuple()
 
@@ -228,7 +682,14 @@ class OperationPlugin:
         return OperationPlugin, tuple(), {'_func': self._func,
                                           'filled_values': self.filled_values,
                                           'input_names': self.input_names,
-                                          'output_names': self.output_names}
+                                          'output_names': self.output_names,
+                                          'vectorizable': self.vectorizable,
+                                          'batch_axis': self.batch_axis,
+                                          'cache_results': self.cache_results,
+                                          'chunk_axes': self.chunk_axes,
+                                          'stream_inputs': self.stream_inputs,
+                                          'max_pending': self.max_pending,
+                                          'output_buffers': self.output_buffers}
 
     def as_parameter(self):
         """Return the operation's inputs as a ready-to-use object with pyqtgraph.
@@ -258,18 +719,19 @@ class OperationPlugin:
         """
         from pyqtgraph.parametertree.Parameter import PARAM_TYPES
 
+        signature = self._get_signature()
+        input_types = self.input_types
         parameter_dicts = []
-        for name, parameter in inspect.signature(self._func).parameters.items():
-            if getattr(parameter.annotation, '__name__', None) in PARAM_TYPES:
+        for name, default, annotation in zip(signature.parameter_names, signature.defaults, signature.annotations):
+            if getattr(annotation, '__name__', None) in PARAM_TYPES:
                 parameter_dict = dict()
                 parameter_dict.update(self.opts.get(name, {}))
                 parameter_dict['name'] = name
-                parameter_dict[
-                    'default'] = parameter.default if parameter.default is not inspect.Parameter.empty else None
+                parameter_dict['default'] = default if default is not inspect.Parameter.empty else None
                 parameter_dict['value'] = self.filled_values[
                     name] if name in self.filled_values else parameter_dict['default']
 
-                parameter_dict['type'] = getattr(self.input_types[name], '__name__', None)
+                parameter_dict['type'] = getattr(input_types[name], '__name__', None)
                 if name in self.limits:
                     parameter_dict['limits'] = self.limits[name]
                 parameter_dict['units'] = self.units.get(name)
@@ -280,13 +742,13 @@ class OperationPlugin:
 
                 parameter_dicts.append(parameter_dict)
 
-            elif getattr(self.input_types[name], "__name__", None) == "Enum":
+            elif getattr(input_types[name], "__name__", None) == "Enum":
                 parameter_dict = dict()
                 parameter_dict['name'] = name
                 parameter_dict['value'] = self.filled_values[
-                    name] if name in self.filled_values else parameter.default
+                    name] if name in self.filled_values else default
                 parameter_dict['values'] = self.limits.get(name) or ["---"],
-                parameter_dict['default'] = parameter.default
+                parameter_dict['default'] = default
                 parameter_dict['type'] = "list",
                 if name in self.limits:
                     parameter_dict['limits'] = self.limits[name]
@@ -309,6 +771,7 @@ def operation(func: Callable,
               limits: dict = None,
               opts: dict = None,
               output_shape: dict = None,
+              output_dtype: dict = None,
               units: dict = None,
               visible: dict = None,
               name: str = None,
@@ -345,6 +808,8 @@ def operation(func: Callable,
         Names for the outputs, or returned values, of the operation.
     output_shape : dict, optional
         Defines expected shapes for the outputs.
+    output_dtype : dict, optional
+        Defines expected dtypes for the outputs.
     units : dict, optional
         Defines units for the parameters in the operation.
     name : str, optional
@@ -384,14 +849,18 @@ def operation(func: Callable,
     if type(output_names) is str:
         output_names = (output_names,)
 
+    # Parse the signature once per operation class; accessors like input_types read this instead of re-inspecting
+    signature = _parse_signature(func)
+
     state = {  # "_func": func,
         "name": name or getattr(func, 'name', getattr(func, '__name__', None)),
         # Fallback to inspecting the function arg names if no input names provided
         "input_names": input_names or getattr(func,
                                               'input_names',
-                                              tuple(inspect.signature(func).parameters.keys())),
+                                              signature.parameter_names),
         "output_names": output_names or getattr(func, 'output_names', getattr(func, "__name__", tuple())),
         "output_shape": output_shape or getattr(func, 'output_shape', {}),
+        "output_dtype": output_dtype or getattr(func, 'output_dtype', {}),
         "input_description": input_descriptions or getattr(func, 'input_descriptions', {}),
         "output_descriptions": output_descriptions or getattr(func, 'output_descriptions', {}),
         "categories": categories or getattr(func, 'categories', []),
@@ -402,7 +871,15 @@ def operation(func: Callable,
         "fixable": fixable or getattr(func, 'fixable', {}),
         "visible": visible or getattr(func, 'visible', {}),
         "opts": opts or getattr(func, 'opts', {}),
-        "hints": getattr(func, 'hints', [])  # TODO: does hints need an arg
+        "hints": getattr(func, 'hints', []),  # TODO: does hints need an arg
+        "vectorizable": getattr(func, 'vectorizable', False),
+        "batch_axis": getattr(func, 'batch_axis', 0),
+        "cache_results": getattr(func, 'cache_results', False),
+        "chunk_axes": getattr(func, 'chunk_axes', {}),
+        "stream_inputs": getattr(func, 'stream_inputs', ()),
+        "max_pending": getattr(func, 'max_pending', 0),
+        "output_buffers": getattr(func, 'output_buffers', {}),
+        "_signature": signature
     }
 
     if state["name"] is None:
@@ -416,6 +893,31 @@ def operation(func: Callable,
     return operation_class
 
 
+# The number of combinations of input shapes and dtypes whose output specs each operation remembers
+_OUTPUT_SPECS_SIZE = 16
+
+
+def _as_shape(shape) -> tuple:
+    return tuple(shape) if np.ndim(shape) else (int(shape),)
+
+
+def _run_until_complete(coroutine):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:  # no running loop
+        pass
+    else:
+        coroutine.close()
+        raise RuntimeError("An asynchronous operation can't be called synchronously from a running event loop; "
+                           "use `await operation.acall(...)` instead.")
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
 def _quick_set(func, attr_name, key, value, init):
     # TODO: does this need to be called initially to provide valid defaults?
     if not hasattr(func, attr_name):
@@ -622,20 +1124,155 @@ def output_names(*names):
     return decorator
 
 
-def output_shape(arg_name: str, shape: Union[int, Collection[int]]):
-    # TODO: how does this work? How do we know the shape before runtime?
+def vectorizable(batch_axis: int = 0):
+    """Decorator to declare that an operation can process a whole batch of inputs in one call.
+
+    When called with `OperationPlugin.batch_call`, a vectorizable operation receives its inputs stacked along
+    `batch_axis`, and must return its outputs stacked along the same axis. Operations that are not vectorizable
+    are called once per item of the batch.
+
+    Parameters
+    ----------
+    batch_axis : int, optional
+        The axis along which inputs and outputs are stacked (default is 0).
+
+    Examples
+    --------
+    Define an operation that inverts a stack of frames in one call.
+
+    >>>@operation\
+    @output_names('inverted')\
+    @vectorizable(batch_axis=0)\
+    def invert(frames: np.ndarray) -> np.ndarray:\
+        return -frames
+    """
+
+    def decorator(func):
+        func.vectorizable = True
+        func.batch_axis = batch_axis
+        return func
+
+    return decorator
+
+
+def cache_results(func):
+    """Decorator to memoize an operation's results.
+
+    Calls with the same (filled) input values return the stored result instead of re-running the operation.
+    Results are kept in `xicam.plugins.operationcache.result_cache`, which evicts the least recently used results once
+    its memory budget is exceeded (see `ResultCache.stats` for hit and miss counts).
+    Cached arrays are shared and read-only; copy them before modifying them in place.
+    The awaited results of asynchronous (`async def`) operations are cached the same way.
+    Only use this for deterministic operations without side effects.
+
+    Examples
+    --------
+    Define an expensive operation that is not recomputed while its inputs don't change.
+
+    >>>@operation\
+    @output_names('filtered')\
+    @cache_results\
+    def median(image: np.ndarray, size: int = 3) -> np.ndarray:\
+        return scipy.ndimage.median_filter(image, size)
+    """
+    func.cache_results = True
+    return func
+
+
+def chunkable(arg_name: str, axis: int = 0):
+    """Decorator to declare that an input or output can be split into blocks along `axis`.
+
+    An operation whose chunked inputs and outputs are all declared can be applied block by block to data larger than
+    memory with `xicam.plugins.blockwise.apply_blockwise`: applying the operation to each block along the declared
+    axes, and concatenating the results, must give the same result as applying it to the whole array.
+
+    Parameters
+    ----------
+    arg_name : str
+        Name of the input or output that can be chunked.
+    axis : int, optional
+        The axis along which `arg_name` can be chunked (default is 0).
+
+    Examples
+    --------
+    Define an operation that normalizes each frame in a stack independently.
+
+    >>>@operation\
+    @output_names('normalized')\
+    @chunkable('frames', axis=0)\
+    @chunkable('normalized', axis=0)\
+    def normalize(frames: np.ndarray, dark: np.ndarray) -> np.ndarray:\
+        return frames - dark
+    """
+
+    def decorator(func):
+        _quick_set(func, 'chunk_axes', arg_name, axis, {})
+        return func
+
+    return decorator
+
+
+def streaming(*stream_inputs: str, max_pending: int = 0):
+    """Decorator to declare which inputs of an operation receive streams, and how far they may be buffered.
+
+    Generator functions are treated as streaming operations: when streamed (see `OperationPlugin.stream`), they
+    receive iterators for their stream inputs and yield their outputs incrementally. Other operations are called
+    once per item of their streams.
+
+    Parameters
+    ----------
+    stream_inputs : str
+        Names of the inputs that receive streams (defaults to the first input).
+    max_pending : int, optional
+        How many items of each input stream may be buffered ahead of the operation. The producer of a stream is
+        blocked while its buffer is full. With the default of 0, streams are pulled lazily, one item at a time.
+
+    Examples
+    --------
+    Integrate event-mode data, emitting a result every `count` events.
+
+    >>>@operation\
+    @output_names('image')\
+    @streaming('events', max_pending=1024)\
+    def integrate(events: Iterator[tuple], shape: tuple = (512, 512), count: int = 10000):\
+        image = np.zeros(shape)\
+        for i, (x, y) in enumerate(events, 1):\
+            image[x, y] += 1\
+            if not i % count:\
+                yield image.copy()
+    """
+
+    def decorator(func):
+        func.stream_inputs = stream_inputs
+        func.max_pending = max_pending
+        return func
+
+    return decorator
+
+
+def output_shape(arg_name: str, shape: Union[int, Collection[int], Callable]):
     """Decorator to set the shape of an output in an operation."
 
+    The shape can either be fixed, or computed from the shapes and dtypes of the inputs by a rule; rules are called
+    with an `ArraySpec` for each array input as keyword arguments (see `OperationPlugin.infer_outputs`).
+
     Parameters
     ----------
     arg_name : str
         Name of the output to define a shape for.
-    shape : int or tuple of ints
-        N-element tuple representing the shape (dimensions) of the output.
+    shape : int or tuple of ints or callable
+        N-element tuple representing the shape (dimensions) of the output, or a rule returning it.
 
     Examples
     --------
-    TODO
+    Define an operation whose output is the transpose of its input.
+
+    >>>@operation\
+    @output_names('transposed')\
+    @output_shape('transposed', lambda image: image.shape[::-1])\
+    @output_dtype('transposed', lambda image: image.dtype)\
+    def transpose(image: np.ndarray) -> np.ndarray:\
+        return image.T
     """
 
     def decorator(func):
@@ -645,6 +1282,68 @@ def output_shape(arg_name: str, shape: Union[int, Collection[int]]):
     return decorator
 
 
+def output_buffer(output_name: str, parameter_name: str = 'out'):
+    """Decorator to declare that an operation can write an output into a caller-provided buffer.
+
+    The buffer is passed through the parameter `parameter_name`, which should default to None, in which case the
+    operation allocates its output as usual. See `OperationPlugin.call_with_buffers`.
+
+    Parameters
+    ----------
+    output_name : str
+        Name of the output written into the buffer.
+    parameter_name : str, optional
+        Name of the parameter that receives the buffer (default is 'out').
+
+    Examples
+    --------
+    Define an operation that writes its output into `out`, if given.
+
+    >>>@operation\
+    @output_names('scaled')\
+    @output_buffer('scaled')\
+    def scale(image: np.ndarray, factor: float = 2., out: np.ndarray = None) -> np.ndarray:\
+        return np.multiply(image, factor, out=out)
+    """
+
+    def decorator(func):
+        _quick_set(func, 'output_buffers', output_name, parameter_name, {})
+        return func
+
+    return decorator
+
+
+def output_dtype(arg_name: str, dtype: Union[np.dtype, type, str, Callable]):
+    """Decorator to set the dtype of an output in an operation.
+
+    As with `output_shape`, the dtype can either be fixed, or computed from the input specs by a rule.
+
+    Parameters
+    ----------
+    arg_name : str
+        Name of the output to define a dtype for.
+    dtype : dtype or callable
+        Anything that `np.dtype` accepts, or a rule returning it.
+
+    Examples
+    --------
+    Define an operation that always outputs 32-bit floats.
+
+    >>>@operation\
+    @output_names('normalized')\
+    @output_shape('normalized', lambda image: image.shape)\
+    @output_dtype('normalized', np.float32)\
+    def normalize(image: np.ndarray) -> np.ndarray:\
+        return (image / image.max()).astype(np.float32)
+    """
+
+    def decorator(func):
+        _quick_set(func, 'output_dtype', arg_name, dtype, {})
+        return func
+
+    return decorator
+
+
 def visible(arg_name: str, is_visible=True):
     """Decorator to set whether an input is visible (shown in GUI) or not.
 
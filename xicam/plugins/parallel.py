@@ -0,0 +1,176 @@
+"""
+Parallel execution of OperationPlugins across a process pool.
+
+`parallel_map` (see `OperationPlugin.map`) fans independent calls of an operation out over worker processes. The
+operation is sent to each worker once, in its picklable form (see `OperationPlugin.__reduce__`). Large arrays travel
+through shared memory blocks rather than being pickled: stacked inputs are copied into a single block that every task
+indexes into, shared inputs are copied once, and workers return large outputs in blocks of their own. Those blocks are
+named after their task, so that the parent can still unlink them when the map fails before it has read them.
+"""
+import multiprocessing
+import secrets
+from collections import namedtuple
+from typing import Sequence, Union
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # python < 3.8; everything is pickled instead
+    shared_memory = None
+
+# A reference to an array (or an item of a stacked array, if index is not None) in a named shared memory block
+SharedArrayRef = namedtuple('SharedArrayRef', ['name', 'shape', 'dtype', 'index'])
+
+
+def _share(array: np.ndarray, blocks: list, name: str = None) -> SharedArrayRef:
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    return SharedArrayRef(block.name, array.shape, array.dtype.str, None)
+
+
+def _shareable(value, threshold) -> bool:
+    return (shared_memory is not None and isinstance(value, np.ndarray) and value.dtype != object
+            and value.nbytes >= threshold)
+
+
+def _output_block_name(prefix: str, index: int, position: int) -> str:
+    # Kept short: some platforms limit shared memory names to 31 characters
+    return f'{prefix}{index}_{position}'
+
+
+def _unlink_output_blocks(prefix: str, length: int, count: int):
+    # Unlink the output blocks that workers created but the parent never read
+    for index in range(length):
+        for position in range(count):
+            try:
+                block = shared_memory.SharedMemory(name=_output_block_name(prefix, index, position))
+            except FileNotFoundError:
+                continue
+            block.close()
+            block.unlink()
+
+
+# Per-worker state
+_worker_operation = None
+_worker_threshold = None
+_worker_prefix = None
+_worker_blocks = {}
+
+
+def _initialize_worker(operation, threshold, prefix):
+    global _worker_operation, _worker_threshold, _worker_prefix
+    _worker_operation = operation
+    _worker_threshold = threshold
+    _worker_prefix = prefix
+
+
+def _attach(value):
+    if not isinstance(value, SharedArrayRef):
+        return value
+    # Stacked inputs are shared by many tasks; keep blocks attached for the life of the worker
+    block = _worker_blocks.get(value.name)
+    if block is None:
+        block = _worker_blocks[value.name] = shared_memory.SharedMemory(name=value.name)
+    array = np.ndarray(value.shape, np.dtype(value.dtype), buffer=block.buf)
+    return array if value.index is None else array[value.index]
+
+
+def _run_task(task):
+    index, kwargs = task
+    result = _worker_operation(**{name: _attach(value) for name, value in kwargs.items()})
+
+    outputs = {}
+    for position, (name, output) in enumerate(_worker_operation._map_outputs(result).items()):
+        if _shareable(output, _worker_threshold):
+            blocks = []
+            outputs[name] = _share(output, blocks, _output_block_name(_worker_prefix, index, position))
+            blocks[0].close()  # the parent unlinks the block once it has read it
+        else:
+            outputs[name] = output
+    return outputs
+
+
+def _allocate(value, length: int) -> np.ndarray:
+    # A stack of `length` outputs like `value`, which the outputs of all tasks are written into
+    if isinstance(value, SharedArrayRef):
+        return np.empty((length,) + tuple(value.shape), np.dtype(value.dtype))
+    value = np.asarray(value)
+    return np.empty((length,) + value.shape, value.dtype)
+
+
+def _collect(value, stack: np.ndarray, index: int):
+    if not isinstance(value, SharedArrayRef):
+        stack[index] = value
+        return
+    block = shared_memory.SharedMemory(name=value.name)
+    try:
+        stack[index] = np.ndarray(value.shape, np.dtype(value.dtype), buffer=block.buf)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def parallel_map(operation, batched: Union[dict, Sequence[dict]], processes: int = None, batch_axis: int = None,
+                 shared_threshold: int = 1024 ** 2, chunksize: int = 1, start_method: str = None, **kwargs) -> dict:
+    """Call `operation` once per item of `batched` across a pool of worker processes.
+
+    See `OperationPlugin.map` for a description of the parameters. The operation's function must be importable by
+    the workers (i.e. defined at the top level of a module). Outputs are written straight into their stacks, which
+    take the dtype of the first call's outputs.
+    """
+    if batch_axis is None:
+        batch_axis = operation.batch_axis
+
+    blocks = []
+    tasks = []
+    prefix = f'xc{secrets.token_hex(4)}_'
+    try:
+        shared_kwargs = {name: _share(value, blocks) if _shareable(value, shared_threshold) else value
+                         for name, value in kwargs.items()}
+
+        if isinstance(batched, dict):
+            stacked = {name: np.moveaxis(np.asarray(value), batch_axis, 0) for name, value in batched.items()}
+            lengths = {len(value) for value in stacked.values()}
+            if len(lengths) > 1:
+                raise ValueError(f"Batched inputs to {operation} have different lengths along axis {batch_axis}: "
+                                 f"{sorted(lengths)}.")
+            length = lengths.pop() if lengths else 0
+
+            refs = {}
+            for name, value in stacked.items():
+                if _shareable(value, shared_threshold):
+                    # One block for the whole stack; each task indexes its item out of it
+                    refs[name] = _share(np.ascontiguousarray(value), blocks)
+            tasks = [dict(shared_kwargs, **{name: refs[name]._replace(index=i) if name in refs else value[i]
+                                            for name, value in stacked.items()})
+                     for i in range(length)]
+        else:
+            tasks = [dict(shared_kwargs, **{name: _share(value, blocks) if _shareable(value, shared_threshold)
+                                            else value for name, value in item.items()})
+                     for item in batched]
+
+        if not tasks:
+            raise ValueError(f"Can't map {operation} over an empty batch.")
+
+        context = multiprocessing.get_context(start_method)
+        initargs = (operation, shared_threshold, prefix)
+        with context.Pool(processes, initializer=_initialize_worker, initargs=initargs) as pool:
+            stacks = None
+            for index, outputs in enumerate(pool.imap(_run_task, enumerate(tasks), chunksize=chunksize)):
+                if stacks is None:
+                    stacks = {name: _allocate(value, len(tasks)) for name, value in outputs.items()}
+                for name, value in outputs.items():
+                    _collect(value, stacks[name], index)
+    except BaseException:
+        # The pool has been terminated; reclaim the outputs of tasks that finished after the failure
+        if shared_memory is not None:
+            _unlink_output_blocks(prefix, len(tasks), len(operation._output_name_tuple()))
+        raise
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return {name: np.moveaxis(stack, 0, batch_axis) for name, stack in stacks.items()}
@@ -8,10 +8,54 @@ from typing import Callable, Dict, Type
 from collections import namedtuple
 from typing import List
 from warnings import warn
+import weakref
 
 
 # TODO allow outputs/inputs to connect
 
+# Whether values of a type can be cloudpickled, for types whose values can be checked by type alone; other types are
+# added on first use (see _is_picklable)
+_picklable_types = {type(None): True, bool: True, int: True, float: True, complex: True, str: True, bytes: True}
+
+
+def _is_picklable(value, _visited: set = None) -> bool:
+    """
+    Check if `value` can be cloudpickled (e.g. to ship a workflow to a distributed executor).
+
+    Arrays of plain data are checked by their dtype, and containers by their items; any other value is serialized at
+    most once per type.
+    """
+    if isinstance(value, (np.ndarray, list, tuple, set, frozenset, dict)):
+        # Containers already being checked are skipped; pickle handles self-references
+        _visited = set() if _visited is None else _visited
+        if id(value) in _visited:
+            return True
+        _visited.add(id(value))
+
+        if isinstance(value, np.ndarray):
+            return not value.dtype.hasobject or all(_is_picklable(item, _visited) for item in value.flat)
+        if isinstance(value, dict):
+            return all(_is_picklable(key, _visited) and _is_picklable(item, _visited) for key, item in value.items())
+        return all(_is_picklable(item, _visited) for item in value)
+
+    value_type = type(value)
+    picklable = _picklable_types.get(value_type)
+    if picklable is None:
+        try:
+            header, _ = serialize(value)
+        except Exception:
+            picklable = False
+        else:
+            # newer versions of distributed report failures in the header instead of raising
+            picklable = header.get('serializer') != 'error'
+        _picklable_types[value_type] = picklable
+    return picklable
+
+
+# The variable layout of each ProcessingPlugin class, with the class attributes it was computed from (see
+# ProcessingPlugin._variable_layout); held weakly, so that dynamically created classes can be collected
+_variable_layouts = weakref.WeakKeyDictionary()
+
 
 class ProcessingPlugin(PluginType):
     # TODO -- hints documentation
@@ -112,33 +156,18 @@ class ProcessingPlugin(PluginType):
     def __new__(cls, *args, **kwargs):
         instance = super(ProcessingPlugin, cls).__new__(cls)
         instance.__init__(*args, **kwargs)
+        inputs = instance._inputs = dict(instance._inputs or {})
+        outputs = instance._outputs = dict(instance._outputs or {})
         var_mapping = dict()
-        for name, param in cls.__dict__.items():
-            if isinstance(param, (InOut)):
-                param.name = instance.inverted_vars[param]
-                clone = param.__class__()
-                clone.__dict__ = param.__dict__.copy()
-                clone.parent = instance
-                instance.inputs[param.name] = clone
-                instance.outputs[param.name] = clone
-                setattr(instance, param.name, clone)
-                var_mapping[param] = clone
-            elif isinstance(param, (Output)):
-                param.name = instance.inverted_vars[param]
-                clone = param.__class__()
-                clone.__dict__ = param.__dict__.copy()
-                clone.parent = instance
-                instance.outputs[param.name] = clone
-                setattr(instance, param.name, clone)
-                var_mapping[param] = clone
-            elif isinstance(param, (Input)):
-                param.name = instance.inverted_vars[param]
-                clone = param.__class__()
-                clone.__dict__ = param.__dict__.copy()
-                clone.parent = instance
-                instance.inputs[param.name] = clone
-                setattr(instance, param.name, clone)
-                var_mapping[param] = clone
+        for name, param, is_input, is_output in cls._variable_layout():
+            clone = param._clone()
+            clone.parent = instance
+            if is_input:
+                inputs[name] = clone
+            if is_output:
+                outputs[name] = clone
+            setattr(instance, name, clone)
+            var_mapping[param] = clone
 
         instance.hints = []
         for hint in cls.hints:
@@ -147,6 +176,37 @@ class ProcessingPlugin(PluginType):
 
         return instance
 
+    def __init_subclass__(cls, **kwargs):
+        super(ProcessingPlugin, cls).__init_subclass__(**kwargs)
+        cls._variable_layout()
+
+    @classmethod
+    def _variable_layout(cls):
+        """
+        Returns the processing variables defined on this class, as a tuple of (name, var, is_input, is_output).
+
+        The layout is computed when the class is created, along with the class's `inverted_vars`. It is recomputed if
+        the class's attributes have been added to or replaced since.
+        """
+        # Identifies the class's attributes cheaply. The variables are held by the layout, so their ids aren't reused;
+        # the types catch another attribute being replaced by a variable that was given its freed id
+        values = tuple(cls.__dict__.values())
+        key = (tuple(map(id, values)), tuple(map(id, map(type, values))))
+        cached = _variable_layouts.get(cls)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        inverted_vars = {
+            param: name for name, param in cls.__dict__.items() if isinstance(param, (Input, Output))
+        }
+        layout = []
+        for param, name in inverted_vars.items():
+            param.name = name
+            layout.append((name, param, isinstance(param, Input), isinstance(param, Output)))
+        layout = tuple(layout)
+        _variable_layouts[cls] = (key, layout, inverted_vars)
+        return layout
+
     def __init__(self, *args, **kwargs):
         super(ProcessingPlugin, self).__init__()
         self._param = None
@@ -211,9 +271,8 @@ class ProcessingPlugin(PluginType):
     @property
     def inverted_vars(self) -> Dict:
         if not self._inverted_vars:
-            self._inverted_vars = {
-                param: name for name, param in self.__class__.__dict__.items() if isinstance(param, (Input, Output))
-            }
+            self.__class__._variable_layout()
+            self._inverted_vars = _variable_layouts[self.__class__][2]
         return self._inverted_vars
 
     @property
@@ -278,6 +337,8 @@ class ProcessingPlugin(PluginType):
 
     def clearConnections(self):
         for input in self.inputs.values():
+            for _, upstream in input._map_inputs:
+                upstream._consumers.discard(input)
             input._map_inputs = []
 
     def detach(self):
@@ -303,37 +364,60 @@ class ProcessingPlugin(PluginType):
         for key in blacklist:
             if key in d:
                 del d[key]
-        return _ProcessingPluginRetriever(), (self.__class__.__name__, d)
+        # All plugins share one retriever, so that pickle stores it (and it resolves each class) once per load
+        return _retriever, (self.__class__.__name__, d)
 
 
 class _ProcessingPluginRetriever(object):
     """
-    When called with the containing class as the first argument,
-    and the name of the nested class as the second argument,
-    returns an instance of the nested class.
+    When called with the name of a ProcessingPlugin class and its
+    pickled attributes, returns a new instance of that class.
+
+    Classes are found through the plugin manager's class-name index, and
+    each class is resolved only once per retriever. A retriever is
+    pickled without its cache, so each pickle load gets a fresh one.
 
     """
 
+    def __init__(self):
+        self._plugin_classes = {}
+
+    def __reduce__(self):
+        return _ProcessingPluginRetriever, ()
+
     def __call__(self, pluginname, internaldata):
-        from xicam.plugins import manager as pluginmanager
+        plugin = self._plugin_classes.get(pluginname)
+        if plugin is None:
+            plugin = self._plugin_classes[pluginname] = self._find_plugin(pluginname)
+
+        p = plugin()
+        p.__dict__ = internaldata
+        return p
+
+    @staticmethod
+    def _find_plugin(pluginname):
+        from xicam.plugins import manager as pluginmanager, State
 
         # if pluginmanager hasn't collected plugins yet, then do it
-        if not pluginmanager.loadcomplete and not pluginmanager.loading:
-            pluginmanager.collectPlugins()
+        if pluginmanager.state == State.READY and not pluginmanager._entrypoint_count() \
+                and not pluginmanager._progress_count():
+            pluginmanager.collect_plugins()
 
-        # look for the plugin matching the saved name and re-instance it
-        for plugin in pluginmanager.getPluginsOfCategory("ProcessingPlugin"):
-            if plugin.__name__ == pluginname:
-                p = plugin()
-                p.__dict__ = internaldata
-                return p
+        # look for the plugin matching the saved name
+        plugin = pluginmanager.get_plugin_by_class_name(pluginname, "ProcessingPlugin")
+        if plugin is not None:
+            return plugin
 
         pluginlist = "\n\t".join(
-            [plugin.__name__ for plugin in pluginmanager.getPluginsOfCategory("ProcessingPlugin")]
+            [getattr(plugin, "__name__", repr(plugin))
+             for plugin in pluginmanager.get_plugins_of_type("ProcessingPlugin")]
         )
         raise ValueError(f"No plugin found with name {pluginname} in list of plugins:{pluginlist}")
 
 
+_retriever = _ProcessingPluginRetriever()
+
+
 def EZProcessingPlugin(method: Callable) -> Type[ProcessingPlugin]:
     """
     Provides an easy-to-use but limited way to create a ProcessingPlugin
@@ -384,6 +468,11 @@ def EZProcessingPlugin(method: Callable) -> Type[ProcessingPlugin]:
 
 class Var(object):
     whitelist = set()
+    # The attributes of all variable types are declared here, as slots can't be combined from several bases (see
+    # InputOutput); this keeps the many Vars of large workflows compact
+    __slots__ = ('workflow', 'parent', '_map_inputs', '_subscriptions', 'name', 'description', 'default',
+                 'units', 'type', '_limits', '_value', 'fixed', 'fixable', 'visible', 'opts', '_param', 'inplace',
+                 '_consumers', '__weakref__')
     """
     Defines a variable.
 
@@ -399,37 +488,100 @@ class Var(object):
     """
 
     def __init__(self):
+        # Every slot is initialized, so that variables can be cloned without checking for unset slots
+        self._param = None
+        self.inplace = False
+        self.name = ''
+        self.description = ''
+        self.default = None
+        self.units = None
+        self.type = None
+        self._limits = None
+        self._value = None
+        self.fixed = False
+        self.fixable = False
+        self.visible = True
+        self.opts = None
         self.value = None
         self.workflow = None
         self.parent = None
         self._map_inputs = []  # type: List[List[str, Var]]
         self._subscriptions = []
+        self._consumers = weakref.WeakSet()  # downstream Vars; weak, so that removed plugins can be collected
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, v):
+        self._value = v
+
+    def _clone(self):
+        """Returns a shallow copy of this variable, with its own connections, without running `__init__`."""
+        clone = self.__class__.__new__(self.__class__)
+        for get, set_ in _var_slots:
+            set_(clone, get(self))
+        if hasattr(self, '__dict__'):  # subclasses defined without __slots__
+            clone.__dict__.update(self.__dict__)
+        clone._map_inputs = list(self._map_inputs)
+        clone._subscriptions = list(self._subscriptions)
+        clone._consumers = weakref.WeakSet(self._consumers)
+        return clone
+
+    def _add_consumer(self, var):
+        """
+        Record `var` as a consumer of this variable's value.
+
+        A variable that is modified in place (see `InputOutput`) must be the only consumer of its upstream value, as no
+        copy is kept for the others.
+        """
+        if var in self._consumers:
+            return
+        for consumer in self._consumers:
+            if consumer.inplace or var.inplace:
+                inplace, other = (consumer, var) if consumer.inplace else (var, consumer)
+                raise ValueError(f"'{inplace.name}' modifies '{self.name}' in place, so it can't be shared with "
+                                 f"'{other.name}'. Declare '{inplace.name}' with inplace=False to process a copy.")
+        self._consumers.add(var)
 
     def connect(self, var):
         # find which variable and connect to it.
+        self._add_consumer(var)
         var._map_inputs.append([var.name, self])
 
     def disconnect(self, var):
-        pass
+        self._consumers.discard(var)
+        var._map_inputs = [map_input for map_input in var._map_inputs if map_input[1] is not self]
 
     def subscribe(self, var):
         # find which variable and connect to it.
+        var._add_consumer(self)
         self._subscriptions.append([var.name, var])
         self._map_inputs.append([self.name, var])
 
     def unsubscribe(self, var):
-        pass
+        var._consumers.discard(self)
+        self._subscriptions = [subscription for subscription in self._subscriptions if subscription[1] is not var]
+        self._map_inputs = [map_input for map_input in self._map_inputs if map_input[1] is not var]
 
     def __reduce__(self):
         d = dict()
         for key in self.whitelist:
             d[key] = getattr(self, key)
-        return self.__class__, tuple(d.values())
+        # Passed by keyword, as the whitelists are unordered
+        return partial(self.__class__, **d), ()
+
+
+# Accessors of Var's slots, which bypass properties (e.g. Input.value)
+_var_slots = tuple((Var.__dict__[name].__get__, Var.__dict__[name].__set__)
+                   for name in Var.__slots__ if name != '__weakref__')
 
 
 class Input(Var):
     whitelist = {'name', 'description', 'default', 'type', 'units', 'min',
                  'max', 'limits', 'fixed', 'fixable', 'visible', 'opts'}
+    __slots__ = ()
 
     """
     Defines an input variable.
@@ -478,8 +630,8 @@ class Input(Var):
                  opts=None,
                  **kwargs):
 
-        self.fixed = fixed
         super(Input, self).__init__()
+        self.fixed = fixed
         self.name = name
         self.description = description
         self.default = default
@@ -491,7 +643,7 @@ class Input(Var):
         self.visible = visible
         self.opts = opts or dict()
         self.opts.update(kwargs)
-        if limits is None:
+        if limits is None and (min is not None or max is not None):
             self._limits = (min, max)
 
     @property
@@ -514,25 +666,17 @@ class Input(Var):
     def limits(self, value):
         self._limits = value
 
-    def __setattr__(self, name, value):
-        if name == "value":
-            try:
-                serialize(value)
-            except:
-                # TODO: narrow except
-                msg.logMessage(f"Value '{value}'on input '{name}' could not be cloudpickled.", level=msg.WARNING)
-            super().__setattr__(name, value)
-        else:
-            super().__setattr__(name, value)
-
     @property
     def value(self):
         return self._value
 
     @value.setter
     def value(self, v):
+        # Checked here rather than in __setattr__, which would slow down every attribute assignment
+        if not _is_picklable(v):
+            msg.logMessage(f"Value '{v}' on input '{self.name}' could not be cloudpickled.", level=msg.WARNING)
         self._value = v
-        if hasattr(self, "_param") and self._param:
+        if self._param:
             self._param.blockSignals(True)
             self._param.setValue(v)
             self._param.blockSignals(False)
@@ -543,6 +687,7 @@ class Input(Var):
 
 class Output(Var):
     whitelist = {'name', 'description', 'type', 'units'}
+    __slots__ = ()
     """
     Defines an output variable.
 
@@ -568,13 +713,37 @@ class Output(Var):
 
 
 class InputOutput(Input, Output):
-    whitelist = Input.whitelist | Output.whitelist
+    whitelist = Input.whitelist | Output.whitelist | {'inplace'}
+    __slots__ = ()
     """
     Represents a variable that acts both as in input and an output.
+
+    Parameters
+    ----------
+    inplace : bool, optional
+        Indicates that the plugin modifies the variable's array in place
+        (the default is False). The variable then holds the upstream array
+        itself, which must be writable, and no intermediate copy is made;
+        connecting it to an upstream variable that has other consumers
+        raises a ValueError.
+
+    Other parameters are the same as for `Input`.
+
     """
 
-    pass
+    def __init__(self, *args, inplace=False, **kwargs):
+        super(InputOutput, self).__init__(*args, **kwargs)
+        self.inplace = inplace
+        # Now that the contract is known, check the default like any other value
+        self.value = self.default
+
+    @Input.value.setter
+    def value(self, v):
+        if self.inplace and isinstance(v, np.ndarray) and not v.flags.writeable:
+            raise ValueError(f"'{self.name}' is modified in place, but was given a read-only array.")
+        Input.value.fset(self, v)
 
 
 class InOut(InputOutput):
+    __slots__ = ()
     warn("InOut has been renamed; use InputOutput", DeprecationWarning)
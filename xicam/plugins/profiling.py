@@ -0,0 +1,198 @@
+"""
+Structured profiling of plugin collection.
+
+A `CollectionProfile` records, for every entrypoint, when it was discovered and queued, how long it waited in each
+queue, how long its import took (with a breakdown of the modules it imported in turn), how long it took to
+instantiate, and any failures. The profile can be exported as plain json, or as a Chrome trace
+(chrome://tracing, or https://ui.perfetto.dev) to see where startup time goes.
+"""
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from timeit import default_timer
+
+
+class CollectionProfile(object):
+    """
+    Records timings of plugin collection stages. All times are seconds relative to the profile's creation.
+
+    While `trace_imports` is enabled, calls to `builtins.__import__` are timed so that each plugin's import can be
+    broken down into the (not yet loaded) modules it pulled in.
+    """
+
+    def __init__(self, trace_imports=True):
+        self._t0 = default_timer()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+        self._base_import = builtins.__import__
+        self.entries = OrderedDict()  # (type_name, name) -> dict
+        self.discovery = []
+        if trace_imports:
+            self.start_import_tracing()
+
+    def _now(self):
+        return default_timer() - self._t0
+
+    def _entry(self, type_name, entrypoint):
+        with self._lock:
+            entry = self.entries.get((type_name, entrypoint.name))
+            if entry is None:
+                entry = self.entries[(type_name, entrypoint.name)] = {'type_name': type_name,
+                                                                      'name': entrypoint.name,
+                                                                      'module_name': entrypoint.module_name,
+                                                                      'status': 'discovered',
+                                                                      'discovered': None,
+                                                                      'queued': None,
+                                                                      'import': None,
+                                                                      'instantiate': None,
+                                                                      'error': None}
+            return entry
+
+    def discovered(self, type_name, entrypoints, start, duration):
+        """ Record the scan of a plugin type's entrypoint group; `start` is a default_timer value."""
+        start -= self._t0
+        self.discovery.append({'type_name': type_name, 'start': start, 'duration': duration, 'count': len(entrypoints)})
+        for entrypoint in entrypoints:
+            self._entry(type_name, entrypoint)['discovered'] = start + duration
+
+    def queued(self, type_name, entrypoint):
+        self._entry(type_name, entrypoint)['queued'] = self._now()
+
+    @contextmanager
+    def stage(self, stage, type_name, entrypoint):
+        """ Time a collection stage ('import' or 'instantiate') of an entrypoint, recording any failure."""
+        entry = self._entry(type_name, entrypoint)
+        record = {'start': self._now(), 'duration': None, 'thread': threading.get_ident()}
+        parent_root = getattr(self._local, 'root', None)  # plugins may load other plugins while importing
+        if stage == 'import':
+            record['imports'] = []
+            self._local.root = record
+        entry[stage] = record
+        try:
+            yield
+        except BaseException as ex:
+            entry['status'] = 'failed'
+            entry['error'] = {'stage': stage, 'exception': repr(ex)}
+            raise
+        else:
+            entry['status'] = 'imported' if stage == 'import' else 'instantiated'
+        finally:
+            record['duration'] = self._now() - record['start']
+            if stage == 'import':
+                self._local.root = parent_root
+
+    def start_import_tracing(self):
+        if self._original_import is not None:
+            return
+        self._original_import = self._base_import = builtins.__import__
+        builtins.__import__ = self._traced_import
+
+    def stop_import_tracing(self):
+        if self._original_import is None:
+            return
+        # Only unhook if nothing has wrapped __import__ on top of us in the meantime
+        if builtins.__import__ == self._traced_import:
+            builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def _traced_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original_import = self._base_import
+        root = getattr(self._local, 'root', None)
+        if root is None:
+            return original_import(name, globals, locals, fromlist, level)
+
+        module_name = name
+        if level:
+            try:
+                module_name = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                pass
+        if module_name in sys.modules:  # only new imports are interesting
+            return original_import(name, globals, locals, fromlist, level)
+
+        stack = self._local.__dict__.setdefault('stack', [])
+        frame = {'module': module_name, 'start': self._now(), 'duration': None, 'imports': []}
+        (stack[-1] if stack else root)['imports'].append(frame)
+        stack.append(frame)
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            stack.pop()
+            frame['duration'] = self._now() - frame['start']
+
+    def summary(self):
+        """ Aggregate counts and times over all entrypoints."""
+        entries = list(self.entries.values())
+
+        def total(stage):
+            return sum(entry[stage]['duration'] or 0 for entry in entries if entry[stage])
+
+        statuses = [entry['status'] for entry in entries]
+        return {'discovered': len(entries),
+                'imported': sum(1 for entry in entries if entry['import'] and entry['status'] != 'failed'),
+                'instantiated': statuses.count('instantiated'),
+                'failed': statuses.count('failed'),
+                'discovery_time': sum(record['duration'] for record in self.discovery),
+                'import_time': total('import'),
+                'instantiate_time': total('instantiate'),
+                'wall_time': self._now()}
+
+    def to_dict(self):
+        entries = []
+        for entry in self.entries.values():
+            entry = dict(entry)
+            # time spent waiting in the load and instantiate queues
+            if entry['import'] and entry['queued'] is not None:
+                entry['load_wait'] = entry['import']['start'] - entry['queued']
+            if entry['instantiate'] and entry['import']:
+                entry['instantiate_wait'] = entry['instantiate']['start'] - (entry['import']['start'] +
+                                                                             entry['import']['duration'])
+            entries.append(entry)
+        return {'summary': self.summary(), 'discovery': self.discovery, 'entrypoints': entries}
+
+    def to_json(self, path=None):
+        """ Export the profile as json; written to `path` if given, else returned as a string."""
+        return self._dump(self.to_dict(), path)
+
+    def to_chrome_trace(self, path=None):
+        """ Export the profile in the Chrome trace event format; written to `path` if given, else returned."""
+        pid = os.getpid()
+        events = []
+
+        def complete_event(name, category, record, tid, args=None):
+            events.append({'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': record['start'] * 1e6, 'dur': (record['duration'] or 0) * 1e6, 'args': args or {}})
+
+        def import_events(frames, tid):
+            for frame in frames:
+                complete_event(frame['module'], 'nested import', frame, tid)
+                import_events(frame['imports'], tid)
+
+        for record in self.discovery:
+            complete_event(f'discover {record["type_name"]}', 'discovery', record, 0, {'count': record['count']})
+
+        for entry in self.entries.values():
+            label = f'{entry["type_name"]}:{entry["name"]}'
+            args = {'module': entry['module_name'], 'status': entry['status'], 'error': entry['error']}
+            for stage in ('import', 'instantiate'):
+                record = entry[stage]
+                if record:
+                    complete_event(f'{stage} {label}', stage, record, record['thread'], args)
+                    import_events(record.get('imports', []), record['thread'])
+
+        return self._dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, path)
+
+    @staticmethod
+    def _dump(data, path):
+        if path is None:
+            return json.dumps(data, indent=1, default=repr)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1, default=repr)
+        return path
@@ -0,0 +1,90 @@
+"""
+Streaming execution of OperationPlugins.
+
+Streaming operations receive iterators of inputs and yield their outputs incrementally (see
+`xicam.plugins.operationplugin.streaming`), so that a live stream of frames can flow through a chain of operations
+with constant memory. Streams are pulled lazily by default; a `BoundedIterator` decouples a producer from its consumer
+with a bounded buffer, blocking the producer when the consumer falls behind.
+"""
+import threading
+from queue import Queue, Full, Empty
+from typing import Iterable, Iterator
+
+_done = object()
+
+
+class BoundedIterator(object):
+    """
+    Iterate over `source` in a background thread, buffering at most `max_pending` items ahead of the consumer.
+
+    When the buffer is full the producer blocks (backpressure). Exceptions raised by the source are re-raised to the
+    consumer. Call `close` (or exhaust the iterator) to stop the producer.
+    """
+
+    def __init__(self, source: Iterable, max_pending: int):
+        self._queue = Queue(maxsize=max_pending)
+        self._closed = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._produce, args=(iter(source),), daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _produce(self, source):
+        try:
+            for item in source:
+                if not self._put((item, None)):
+                    return
+        except BaseException as ex:
+            self._put((_done, ex))
+        else:
+            self._put((_done, None))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        item, exception = self._queue.get()
+        if item is _done:
+            self._finished = True
+            if exception is not None:
+                raise exception
+            raise StopIteration
+        return item
+
+    def close(self):
+        self._finished = True
+        self._closed.set()
+        # Unblock the producer if it is waiting on a full buffer
+        try:
+            while True:
+                self._queue.get_nowait()
+        except Empty:
+            pass
+
+
+def stream_chain(source: Iterable, *operations) -> Iterator:
+    """Pipe `source` through a chain of operations, feeding each operation's outputs into the next one's stream.
+
+    Each operation receives the stream on its first stream input (see `OperationPlugin.stream_inputs`); any other
+    inputs are taken from the operation's `filled_values`.
+
+    Examples
+    --------
+    >>>averaged = stream_chain(detector_frames, subtract_dark(), running_average())\\
+    for frame in averaged:\\
+        display(frame)
+    """
+    stream = source
+    for operation in operations:
+        stream = operation.stream(**{operation._stream_input_names()[0]: stream})
+    return stream
@@ -0,0 +1,38 @@
+import builtins
+import json
+
+import entrypoints
+import pytest
+
+
+def test_profile_stages():
+    from xicam.plugins.profiling import CollectionProfile
+
+    original_import = builtins.__import__
+    profile = CollectionProfile()
+    entrypoint = entrypoints.EntryPoint("minidom", "xml.dom.minidom", "parseString")
+    broken_entrypoint = entrypoints.EntryPoint("broken", "xicam_nonexistent_module", "Plugin")
+
+    profile.queued("TestPlugin", entrypoint)
+    with profile.stage("import", "TestPlugin", entrypoint):
+        entrypoint.load()
+    with profile.stage("instantiate", "TestPlugin", entrypoint):
+        pass
+    with pytest.raises(ImportError):
+        with profile.stage("import", "TestPlugin", broken_entrypoint):
+            broken_entrypoint.load()
+    profile.stop_import_tracing()
+    assert builtins.__import__ is original_import
+
+    summary = profile.summary()
+    assert summary["discovered"] == 2
+    assert summary["instantiated"] == 1
+    assert summary["failed"] == 1
+
+    exported = json.loads(profile.to_json())
+    entry = exported["entrypoints"][0]
+    assert entry["load_wait"] >= 0
+    assert entry["instantiate_wait"] >= 0
+
+    trace = json.loads(profile.to_chrome_trace())
+    assert {event["cat"] for event in trace["traceEvents"]} >= {"import", "instantiate"}
@@ -0,0 +1,40 @@
+import sys
+
+
+def test_manifest_roundtrip(tmp_path):
+    import entrypoints
+    from xicam.plugins.manifest import EntrypointManifest
+
+    path = str(tmp_path / "manifest.json")
+    manifest = EntrypointManifest(path)
+    named, group_all = manifest.get_group("xicam.plugins.PluginType")
+    assert set(named) == set(entrypoints.get_group_named("xicam.plugins.PluginType"))
+    manifest.save()
+
+    warm_manifest = EntrypointManifest(path)
+    warm_manifest.refresh()
+    warm_named, warm_all = warm_manifest.get_group("xicam.plugins.PluginType")
+    assert not warm_manifest._dirty  # served from disk
+    assert {name: ep.module_name for name, ep in warm_named.items()} == \
+           {name: ep.module_name for name, ep in named.items()}
+    assert len(warm_all) == len(group_all)
+
+
+def test_manifest_invalidation(tmp_path, monkeypatch):
+    from xicam.plugins.manifest import EntrypointManifest, environment_fingerprint
+
+    path = str(tmp_path / "manifest.json")
+    manifest = EntrypointManifest(path)
+    manifest.get_group("xicam.plugins.PluginType")
+    manifest.save()
+
+    # "install" a new distribution
+    site_dir = tmp_path / "site"
+    (site_dir / "newplugin-1.0.dist-info").mkdir(parents=True)
+    before = environment_fingerprint()
+    monkeypatch.setattr(sys, "path", sys.path + [str(site_dir)])
+    assert environment_fingerprint() != before
+
+    stale_manifest = EntrypointManifest(path)
+    stale_manifest.refresh()
+    assert stale_manifest._groups == {}
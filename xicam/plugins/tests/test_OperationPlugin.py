@@ -1,3 +1,6 @@
+import inspect
+from collections import OrderedDict
+
 import pytest
 
 import numpy as np
@@ -5,7 +8,8 @@ import numpy as np
 from xicam.core import msg
 # from xicam.plugins import operation
 from xicam.plugins.operationplugin import (display_name, fixed, input_names, limits, opts, output_names,
-                                           output_shape, plot_hint, units, visible, ValidationError, operation)
+                                           output_buffer, output_dtype, output_shape, plot_hint, units, visible,
+                                           ValidationError, operation, cache_results, streaming, vectorizable)
 
 
 # Tests both the function interface and Operation API interface
@@ -372,6 +376,341 @@ def test_as_parameter():
     assert func().as_parameter() == expected_as_parameter
 
 
+def test_signature_cached():
+    from xicam.plugins.operationplugin import OperationSignature
+
+    @operation
+    @output_names('sum')
+    def func(a: int, b: float = 1.0) -> float:
+        return a + b
+
+    assert func._signature == OperationSignature(('a', 'b'), (inspect.Parameter.empty, 1.0), (int, float), float)
+    op = func()
+    assert op.input_types == OrderedDict([('a', int), ('b', float)])
+    assert op.output_types == OrderedDict([('sum', float)])
+
+    # Instances restored through __reduce__ parse their own signature
+    cls, args, state = op.__reduce__()
+    restored = cls(*args)
+    restored.__dict__.update(state)
+    assert restored.input_types == op.input_types
+
+
+# infer_outputs, @output_dtype
+class TestInferOutputs:
+    def test_declared(self):
+        from xicam.plugins.operationplugin import ArraySpec
+
+        @operation
+        @output_names('binned')
+        @output_shape('binned', lambda image: (image.shape[0] // 2, image.shape[1] // 2))
+        @output_dtype('binned', lambda image: image.dtype)
+        def bin2x2(image: np.ndarray) -> np.ndarray:
+            raise AssertionError('Declared outputs should not need a dry run')
+
+        outputs = bin2x2().infer_outputs(image=ArraySpec((2048, 1024), np.uint16))
+        assert outputs == {'binned': ((1024, 512), np.dtype(np.uint16))}
+
+    def test_dry_run(self):
+        from xicam.plugins.operationplugin import ArraySpec
+
+        @operation
+        @output_names('corrected', 'total')
+        def correct(frames: np.ndarray, dark: np.ndarray, scale: float = 2.):
+            return (frames - dark) * scale, frames.sum()
+
+        op = correct()
+        outputs = op.infer_outputs(frames=ArraySpec((100, 64, 64), np.uint16),
+                                   dark=np.zeros((64, 64), dtype=np.float32))
+        assert outputs['corrected'] == ((100, 64, 64), np.dtype(np.float32))
+        assert outputs['total'].shape == ()
+
+        buffers = op.allocate_outputs(frames=ArraySpec((10, 8, 8), np.uint16), dark=ArraySpec((8, 8), np.float32))
+        assert buffers['corrected'].shape == (10, 8, 8)
+
+    def test_in_place(self):
+        from xicam.plugins.operationplugin import ArraySpec, OperationError
+
+        @operation
+        @output_names('inverted')
+        def invert(image: np.ndarray) -> np.ndarray:
+            image *= -1
+            return image
+
+        with pytest.raises(OperationError):
+            invert().infer_outputs(image=ArraySpec((4, 4), np.float64))
+
+    def test_tuple_inputs(self):
+        @operation
+        @output_names('clipped')
+        def clip(image: np.ndarray, bounds: tuple = ((0, 1), (2, 3))) -> np.ndarray:
+            return np.clip(image, bounds[0][0], bounds[1][1])
+
+        # tuples are inputs like any other, not array specs
+        assert clip().infer_outputs(image=np.zeros((4, 4)), bounds=((0, 1), (2, 3))) == {
+            'clipped': ((4, 4), np.dtype(np.float64))}
+
+    def test_not_dry_runnable(self):
+        from xicam.plugins.operationplugin import ArraySpec, OperationError
+
+        @operation
+        @output_names('doubled')
+        async def double(image: np.ndarray) -> np.ndarray:
+            return image * 2
+
+        with pytest.raises(OperationError):
+            double().infer_outputs(image=ArraySpec((4, 4), np.float64))
+
+
+# @output_buffer
+class TestOutputBuffers:
+    def test_call_with_buffers(self):
+        @operation
+        @output_names('corrected')
+        @output_buffer('corrected', 'out')
+        def subtract_dark(frame: np.ndarray, dark: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+            return np.subtract(frame, dark, out=out)
+
+        op = subtract_dark()
+        dark = np.ones((8, 8))
+        results = [op.call_with_buffers(frame=np.full((8, 8), i, dtype=float), dark=dark) for i in range(5)]
+
+        # steady state reuses a ring of two buffers
+        assert op.buffer_pool.allocations == 2
+        assert results[0] is results[2] is results[4]
+        assert results[1] is results[3]
+        np.testing.assert_array_equal(results[4], 3)
+
+        # new input shapes get new buffers
+        op.call_with_buffers(frame=np.zeros((4, 4)), dark=np.zeros((4, 4)))
+        assert op.buffer_pool.allocations == 3
+
+    def test_dry_runs(self):
+        dry_runs = []
+
+        @operation
+        @output_names('scaled')
+        @output_buffer('scaled', 'out')
+        def scale(frame: np.ndarray, factor: float, out: np.ndarray = None) -> np.ndarray:
+            if not frame.flags.writeable:  # dry runs receive read-only proxies
+                dry_runs.append(factor)
+            return np.multiply(frame, factor, out=out)
+
+        op = scale()
+        frame = np.ones((8, 8))
+        for factor in range(100):
+            op.call_with_buffers(frame=frame, factor=float(factor))
+        assert len(dry_runs) == 1  # scalar values don't change the output shapes
+
+        for size in range(1, 40):
+            op.call_with_buffers(frame=np.ones((size, size)), factor=1.)
+        assert len(op._output_specs) <= 16
+
+    def test_created_on_use(self):
+        import cloudpickle
+
+        @operation
+        @output_names('b')
+        def func(a):
+            return a
+
+        op = func()
+        assert '_buffer_pool' not in vars(op) and '_output_specs' not in vars(op)
+        op.call_with_buffers(a=np.ones(3))
+        op.buffer_pool
+        assert '_buffer_pool' in vars(op) and '_output_specs' in vars(op)
+
+        restored = cloudpickle.loads(cloudpickle.dumps(op))
+        assert '_buffer_pool' not in vars(restored) and '_output_specs' not in vars(restored)
+
+    def test_bad_parameter(self):
+        with pytest.raises(ValidationError):
+            @operation
+            @output_names('a')
+            @output_buffer('a', 'buffer')
+            def func(x, out=None):
+                return x
+
+
+class TestBatchCall:
+    def test_looped(self):
+        @operation
+        @output_names('square')
+        def square(n: int = 2, offset: int = 0) -> int:
+            return n ** 2 + offset
+
+        op = square()
+        assert not op.vectorizable
+        result = op.batch_call({'n': np.arange(4)}, offset=1)
+        np.testing.assert_array_equal(result['square'], [1, 2, 5, 10])
+        result = op.batch_call([{'n': 1}, {'n': 3}])
+        np.testing.assert_array_equal(result['square'], [1, 9])
+
+    def test_vectorizable(self):
+        calls = []
+
+        @operation
+        @output_names('negative', 'double')
+        @vectorizable(batch_axis=1)
+        def func(frames: np.ndarray):
+            calls.append(frames.shape)
+            return -frames, frames * 2
+
+        op = func()
+        frames = [np.ones(3), np.zeros(3)]
+        result = op.batch_call([{'frames': frame} for frame in frames])
+        assert calls == [(3, 2)]
+        np.testing.assert_array_equal(result['negative'], -np.stack(frames, axis=1))
+        np.testing.assert_array_equal(result['double'], 2 * np.stack(frames, axis=1))
+
+    def test_mismatched_lengths(self):
+        @operation
+        def func(a, b):
+            return a + b
+
+        with pytest.raises(ValueError):
+            func().batch_call({'a': np.arange(2), 'b': np.arange(3)})
+
+    def test_empty(self):
+        @operation
+        def func(a):
+            return a
+
+        with pytest.raises(ValueError):
+            func().batch_call([])
+        with pytest.raises(ValueError):
+            func().batch_call({'a': np.zeros((0, 3))})
+
+
+class TestStream:
+    def test_generator(self):
+        @operation
+        @output_names('average')
+        def running_average(frames, weight: float = .5):
+            average = None
+            for frame in frames:
+                average = frame if average is None else average + weight * (frame - average)
+                yield average
+
+        op = running_average()
+        assert op.streaming
+        assert list(op.stream(frames=iter([0., 2., 4.]))) == [0., 1., 2.5]
+
+    def test_chain(self):
+        from xicam.plugins.streaming import stream_chain
+
+        @operation
+        @output_names('scaled')
+        def scale(frame, factor: int = 2):
+            return frame * factor
+
+        @operation
+        @output_names('total')
+        @streaming('values', max_pending=2)
+        def cumulative(values):
+            total = 0
+            for value in values:
+                total += value
+                yield total
+
+        assert not scale.streaming
+        assert list(stream_chain(range(4), scale(), cumulative())) == [0, 2, 6, 12]
+
+    def test_backpressure(self):
+        import threading
+        from xicam.plugins.streaming import BoundedIterator
+
+        produced = []
+        blocked = threading.Event()
+
+        def source():
+            for i in range(10):
+                produced.append(i)
+                if len(produced) > 3:
+                    blocked.set()
+                yield i
+
+        bounded = BoundedIterator(source(), max_pending=2)
+        assert not blocked.wait(.5)  # buffer holds 2 items, and the producer holds a 3rd
+        assert list(bounded) == list(range(10))
+
+    def test_bad_stream_input(self):
+        with pytest.raises(ValidationError):
+            @operation
+            @streaming('b')
+            def func(a):
+                yield a
+
+    def test_bad_stream(self):
+        @operation
+        @output_names('b')
+        def func(a):
+            yield from a
+
+        # raised when streaming starts, not on the first item
+        with pytest.raises(TypeError):
+            func().stream()
+        with pytest.raises(TypeError):
+            func().stream(a=1)
+
+
+class TestAsync:
+    def test_concurrent(self):
+        import asyncio
+        import time
+
+        @operation
+        @output_names('echo')
+        async def fetch(value, delay: float = .2):
+            await asyncio.sleep(delay)
+            return value
+
+        assert fetch.asynchronous
+
+        async def fetch_all():
+            return await asyncio.gather(*(fetch().acall(value=i) for i in range(10)))
+
+        loop = asyncio.new_event_loop()
+        start = time.time()
+        try:
+            assert loop.run_until_complete(fetch_all()) == list(range(10))
+        finally:
+            loop.close()
+        assert time.time() - start < 1  # ran concurrently, not in sequence
+
+    def test_sync_adapters(self):
+        import asyncio
+
+        @operation
+        async def double(a):
+            return a * 2
+
+        @operation
+        def triple(a):
+            return a * 3
+
+        # synchronous callers of async operations, and async callers of synchronous operations
+        assert double()(a=2) == 4
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(triple().acall(a=2)) == 6
+        finally:
+            loop.close()
+
+    def test_pickled(self):
+        import cloudpickle
+
+        @operation
+        @cache_results
+        async def double(a):
+            return a * 2
+
+        restored = cloudpickle.loads(cloudpickle.dumps(double()))
+        assert restored.asynchronous
+        assert restored.cache_results
+        assert restored(a=2) == 4
+
+
 # TODO: BrokenPipe and ValueError: I/O operation on closed file exceptions occur:
 # * more than one of these workflow tests is run
 # * one of the workflow tests is run, and a test above has a print() in it
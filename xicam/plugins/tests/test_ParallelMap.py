@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pytest
+
+from xicam.plugins.operationplugin import operation, output_names
+
+
+# Functions run by worker processes must be importable, so they are defined at the top level (and not replaced by
+# their operation class)
+@output_names('corrected', 'total')
+def subtract_dark_func(frame: np.ndarray, dark: np.ndarray):
+    return frame - dark, float(frame.sum())
+
+
+subtract_dark = operation(subtract_dark_func)
+
+
+@output_names('scaled')
+async def scale_func(frame: np.ndarray, factor: float = 2):
+    return frame * factor
+
+
+scale = operation(scale_func)
+
+
+@output_names('doubled')
+def double_or_fail_func(frame: np.ndarray):
+    if frame[0, 0] == 3:
+        raise ValueError("bad frame")
+    return frame * 2
+
+
+double_or_fail = operation(double_or_fail_func)
+
+
+def test_map_stacked():
+    frames = np.random.random((6, 64, 64))
+    dark = np.random.random((64, 64))
+
+    result = subtract_dark().map({'frame': frames}, processes=2, shared_threshold=1024, dark=dark)
+
+    np.testing.assert_allclose(result['corrected'], frames - dark)
+    np.testing.assert_allclose(result['total'], frames.sum(axis=(1, 2)))
+
+
+def test_map_sequence():
+    frames = [np.full((32, 32), i, dtype=np.float32) for i in range(4)]
+    dark = np.ones((32, 32), dtype=np.float32)
+
+    result = subtract_dark().map([{'frame': frame} for frame in frames], processes=2, shared_threshold=1, dark=dark)
+
+    np.testing.assert_array_equal(result['corrected'], np.stack(frames) - dark)
+    assert result['corrected'].dtype == np.float32
+
+
+def test_map_spawn():
+    # Spawned workers receive the operation through its pickled form, which must keep its flags
+    frames = np.random.random((4, 16, 16))
+
+    result = scale().map({'frame': frames}, processes=2, start_method='spawn', batch_axis=1)
+
+    np.testing.assert_allclose(result['scaled'], frames * 2)
+    with pytest.raises(ValueError):
+        scale().map([], processes=1)
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="shared memory blocks aren't listed in /dev/shm")
+def test_map_failure_releases_blocks():
+    frames = np.stack([np.full((64, 64), i, dtype=float) for i in range(8)])
+    blocks = set(os.listdir('/dev/shm'))
+
+    with pytest.raises(ValueError):
+        double_or_fail().map({'frame': frames}, processes=2, shared_threshold=1)
+
+    assert set(os.listdir('/dev/shm')) <= blocks
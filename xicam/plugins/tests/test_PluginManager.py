@@ -0,0 +1,293 @@
+import pickle
+import sys
+import threading
+import time
+from collections import Counter
+
+import entrypoints
+import pytest
+
+from xicam.plugins import XicamPluginManager, RegistrySnapshot, PluginQueue, Filters, PluginDelta, State
+
+PROCESSING_PLUGIN = {"ProcessingPlugin": ("xicam.plugins.processingplugin", "ProcessingPlugin")}
+
+
+def write_plugin_module(path, module_name, class_name="Plugin"):
+    path.joinpath(f"{module_name}.py").write_text(
+        "from xicam.plugins.processingplugin import ProcessingPlugin\n\n\n"
+        f"class {class_name}(ProcessingPlugin):\n"
+        "    pass\n")
+
+
+def test_plugin_args():
+    from xicam.plugins import parse_plugin_args
+
+    args = parse_plugin_args(["--profile-plugins", "--lazy-plugins", "--no-plugin-cache"])
+    assert args.profileplugins and args.lazyplugins and args.noplugincache
+
+    # Other programs' flags are not taken for abbreviations
+    args = parse_plugin_args(["--profile", "--lazy", "--no-plugin"])
+    assert not (args.profileplugins or args.lazyplugins or args.noplugincache)
+
+
+def test_parallel_load():
+    lock = threading.Lock()
+    loads, active, overlapped = Counter(), Counter(), set()
+
+    class RecordingEntryPoint(entrypoints.EntryPoint):
+        """ An entrypoint that records its loads instead of importing anything."""
+
+        def load(self):
+            with lock:
+                loads[self.name] += 1
+                active[self.module_name] += 1
+                if active[self.module_name] > 1:
+                    overlapped.add(self.module_name)
+            try:
+                time.sleep(0.01)
+                if self.object_name == "Broken":
+                    raise RuntimeError("broken plugin")
+                return type(self.object_name, (), {})
+            finally:
+                with lock:
+                    active[self.module_name] -= 1
+
+    manager = XicamPluginManager(RegistrySnapshot(PROCESSING_PLUGIN, []))
+    manager.load_workers = 4
+    entrypoints_ = [RecordingEntryPoint(f"{module}{i}", f"xicam_fake_{module}", "Plugin")
+                    for module in "abc" for i in range(3)]
+    entrypoints_.append(RecordingEntryPoint("broken", "xicam_fake_a", "Broken"))
+    broken_future = manager._plugin_future("ProcessingPlugin", "broken")
+
+    manager.state = State.LOADING
+    for entrypoint in entrypoints_ + entrypoints_[:2]:  # some queued twice, as when promoted
+        manager._load_queue.put(("ProcessingPlugin", entrypoint))
+    manager._load_entrypoints()
+
+    # Every entrypoint is loaded exactly once, one at a time per module
+    assert loads == Counter({entrypoint.name: 1 for entrypoint in entrypoints_})
+    assert not overlapped
+    assert set(manager._load_cache["ProcessingPlugin"]) == {entrypoint.name for entrypoint in entrypoints_[:-1]}
+    assert isinstance(manager.failed_plugins[("ProcessingPlugin", "broken")], RuntimeError)
+    with pytest.raises(ImportError):
+        broken_future.result(timeout=0)
+
+    queued = []
+    while not manager._instantiate_queue.empty():
+        queued.append(manager._instantiate_queue.get()[1].name)
+    assert sorted(queued) == sorted(entrypoint.name for entrypoint in entrypoints_[:-1])
+
+
+def test_lazy_proxy_name(tmp_path, monkeypatch):
+    from xicam.plugins import LazyPluginProxy
+
+    write_plugin_module(tmp_path, "xicam_test_lazy_plugin")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    manager = XicamPluginManager(RegistrySnapshot(
+        PROCESSING_PLUGIN, [("ProcessingPlugin", "Lazy", "xicam_test_lazy_plugin", "Plugin")]))
+
+    proxy, = manager.get_plugins_of_type("ProcessingPlugin")
+    assert isinstance(proxy, LazyPluginProxy)
+    assert proxy.name() == "Lazy"
+    assert "xicam_test_lazy_plugin" not in sys.modules
+
+    assert manager.get_plugin_by_name("Lazy").__name__ == "Plugin"
+    assert "xicam_test_lazy_plugin" in sys.modules
+
+
+def test_lazy_proxy_failure(monkeypatch):
+    manager = XicamPluginManager(RegistrySnapshot(
+        PROCESSING_PLUGIN, [("ProcessingPlugin", "Broken", "xicam_nonexistent_module", "Plugin")]))
+
+    proxy, = manager.get_plugins_of_type("ProcessingPlugin")
+    with pytest.raises(ImportError):
+        proxy.resolve()
+
+    # The proxy is evicted, and the failure is recorded rather than retried
+    assert manager.get_plugins_of_type("ProcessingPlugin") == []
+    assert isinstance(manager.failed_plugins[("ProcessingPlugin", "Broken")], ImportError)
+    monkeypatch.setattr(manager, "_load_entrypoint", None)  # not imported again
+    with pytest.raises(ImportError):
+        proxy.resolve()
+
+
+def test_profile_finished_on_hydrate(monkeypatch):
+    import builtins
+
+    original_import = builtins.__import__
+    manager = XicamPluginManager()
+    saved = []
+    monkeypatch.setattr(manager, "_export_profile", True)
+    monkeypatch.setattr(manager, "_save_profile", lambda: saved.append(manager.profile))
+
+    profile = manager.enable_profiling()
+    assert builtins.__import__ is not original_import
+    manager.hydrate(RegistrySnapshot(PROCESSING_PLUGIN, []))
+    assert builtins.__import__ is original_import
+    assert saved == [profile]
+
+
+class Plugin:
+    pass
+
+
+def test_plugin_future():
+    manager = XicamPluginManager(RegistrySnapshot(PROCESSING_PLUGIN, []))
+    future = manager._plugin_future("ProcessingPlugin", "Future")
+    assert not future.done()
+
+    manager.collect_plugin("Future", Plugin, "ProcessingPlugin")
+    assert future.result(timeout=0) is Plugin
+    # Futures requested later resolve immediately
+    assert manager._plugin_future("ProcessingPlugin", "Future").result(timeout=0) is Plugin
+    assert manager.get_plugin_future("Future").result(timeout=0) is Plugin
+    assert manager.get_plugin_future("Missing").result(timeout=0) is None
+
+
+def test_ambiguous_name():
+    manager = XicamPluginManager(RegistrySnapshot(
+        dict(PROCESSING_PLUGIN, OperationPlugin=("xicam.plugins.operationplugin", "OperationPlugin")), []))
+    other = type("Other", (), {})
+    manager.collect_plugin("Shared", Plugin, "ProcessingPlugin")
+    manager.collect_plugin("Shared", other, "OperationPlugin")
+
+    # Untyped lookups of a name shared by several types are an error, rather than picking one
+    with pytest.raises(ValueError):
+        manager.get_plugin_by_name("Shared")
+    assert manager.get_plugin_by_name("Shared", "ProcessingPlugin") is Plugin
+    assert manager.get_plugin_by_name("Shared", "OperationPlugin") is other
+
+    manager._unregister_plugin("OperationPlugin", "Shared")
+    assert manager.get_plugin_by_name("Shared") is Plugin
+
+
+def test_queue_priority_order():
+    queue = PluginQueue()
+    for item, priority in [("low", 0), ("first", 1), ("high", 5), ("second", 1)]:
+        queue.put(item, priority)
+
+    # Higher priorities first; equal priorities last-in, first-out
+    assert [queue.get() for _ in range(4)] == ["high", "second", "first", "low"]
+
+
+def test_priority_order():
+    from xicam.plugins import LiveEntryPoint
+
+    manager = XicamPluginManager(RegistrySnapshot(PROCESSING_PLUGIN, []))
+    deltas = []
+    manager.attach(deltas.append, Filters.DELTA)
+    manager.notify_interval = 60
+    manager.type_priorities["ProcessingPlugin"] = 1
+    manager.plugin_priorities["Important"] = 10
+    assert manager._priority("ProcessingPlugin", "Other") == 1
+
+    manager.state = State.LOADING
+    for name in ["Other", "Important", "Requested"]:
+        manager._load_queue.put(("ProcessingPlugin", LiveEntryPoint(name, Plugin)),
+                                manager._priority("ProcessingPlugin", name))
+    manager.prioritize("Requested")
+    manager._load_plugins()
+
+    delta, = deltas
+    assert [name for _, name in delta.added] == ["Requested", "Important", "Other"]
+
+
+def test_synchronous_collection():
+    manager = XicamPluginManager(RegistrySnapshot(PROCESSING_PLUGIN, []))
+    completed = []
+    manager.attach(lambda: completed.append(manager.state), Filters.COMPLETE)
+
+    # Without a Qt event loop, collection is complete when it returns
+    assert manager.synchronous
+    manager.collect_plugin("Sync", Plugin, "ProcessingPlugin")
+    assert manager.state == State.READY
+    assert completed == [State.READY]
+    assert manager.get_plugin_by_name("Sync", "ProcessingPlugin") is Plugin
+
+
+def test_hot_reload(tmp_path, monkeypatch):
+    write_plugin_module(tmp_path, "xicam_test_hot_plugin")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    manager = XicamPluginManager(RegistrySnapshot(
+        PROCESSING_PLUGIN, [("ProcessingPlugin", "Hot", "xicam_test_hot_plugin", "Plugin")]))
+    try:
+        original = manager.get_plugin_by_name("Hot")
+        reloads, deltas = [], []
+        manager.attach(reloads.append, Filters.RELOAD)
+        manager.attach(deltas.append, Filters.DELTA)
+
+        with pytest.warns(UserWarning):
+            manager.hot_reload()
+        assert reloads == []  # nothing changed on disk
+
+        with tmp_path.joinpath("xicam_test_hot_plugin.py").open("a") as module:
+            module.write("\n\nreloaded = True\n")
+        with pytest.warns(UserWarning):
+            manager.hot_reload()
+        assert reloads == [{("ProcessingPlugin", "Hot")}]
+        assert deltas == [PluginDelta([("ProcessingPlugin", "Hot")], [("ProcessingPlugin", "Hot")])]
+        reloaded = manager.get_plugin_by_name("Hot")
+        assert reloaded is not original
+        assert sys.modules["xicam_test_hot_plugin"].reloaded
+    finally:
+        sys.modules.pop("xicam_test_hot_plugin", None)
+
+
+def test_coalesced_notifications():
+    manager = XicamPluginManager(RegistrySnapshot(PROCESSING_PLUGIN, []))
+    updates, deltas = [], []
+    manager.attach(lambda: updates.append(None), Filters.UPDATE)
+    manager.attach(deltas.append, Filters.DELTA)
+    manager.notify_interval = 60
+    manager._flush_updates(force=True)  # nothing pending; nothing sent
+
+    manager._register_plugin("ProcessingPlugin", "A", Plugin)
+    manager._flush_updates()
+    manager._register_plugin("ProcessingPlugin", "B", Plugin)
+    manager._register_plugin("ProcessingPlugin", "C", Plugin)
+    manager._unregister_plugin("ProcessingPlugin", "C")  # never announced, so never retracted
+    manager._flush_updates()
+    assert len(updates) == len(deltas) == 1  # the first flush; the second is throttled
+
+    manager._unregister_plugin("ProcessingPlugin", "A")
+    manager._flush_updates(force=True)
+    assert len(updates) == 2
+    assert deltas == [PluginDelta([("ProcessingPlugin", "A")], []),
+                      PluginDelta([("ProcessingPlugin", "B")], [("ProcessingPlugin", "A")])]
+
+
+def test_snapshot(tmp_path, monkeypatch, caplog):
+    write_plugin_module(tmp_path, "xicam_test_snapshot_plugin")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    from xicam_test_snapshot_plugin import Plugin as ImportablePlugin
+
+    class LocalPlugin:
+        pass
+
+    MainPlugin = type("MainPlugin", (), {"__module__": "__main__"})
+
+    try:
+        manager = XicamPluginManager(RegistrySnapshot(PROCESSING_PLUGIN, []))
+        manager.collect_plugin("Importable", ImportablePlugin, "ProcessingPlugin")
+        manager.collect_plugin("Local", LocalPlugin, "ProcessingPlugin")
+        manager.collect_plugin("Main", MainPlugin, "ProcessingPlugin")
+
+        # A discovered plugin that fails to load
+        manager._add_entrypoint("ProcessingPlugin", "Broken",
+                                entrypoints.EntryPoint("Broken", "xicam_nonexistent_module", "Plugin"))
+        manager.state = State.LOADING
+        manager._load_queue.put(("ProcessingPlugin", manager._entrypoints["ProcessingPlugin"]["Broken"]))
+        manager._load_plugins()
+        assert ("ProcessingPlugin", "Broken") in manager.failed_plugins
+
+        caplog.clear()
+        snapshot = pickle.loads(pickle.dumps(manager.snapshot()))
+        assert [name for _, name, *_ in snapshot.entries] == ["Importable"]
+        warnings = [record.getMessage() for record in caplog.records if record.levelname == "WARNING"]
+        assert any("Local" in warning for warning in warnings)
+        assert any("Main" in warning for warning in warnings)
+
+        worker_manager = XicamPluginManager(snapshot)
+        assert worker_manager.get_plugin_by_name("Importable") is ImportablePlugin
+    finally:
+        sys.modules.pop("xicam_test_snapshot_plugin", None)
@@ -1,5 +1,18 @@
 import pytest
 
+from xicam.plugins.processingplugin import ProcessingPlugin, Input, Output
+
+
+# Unpickling finds plugins through the plugin manager, which imports them by name; so this one is defined at the
+# top level
+class PicklableSumPlugin(ProcessingPlugin):
+    a = Input(default=1)
+    b = Input(default=2)
+    c = Output()
+
+    def evaluate(self):
+        self.c.value = self.a.value + self.b.value
+
 
 @pytest.yield_fixture(autouse=True)
 def with_QApplication():
@@ -42,3 +55,182 @@ def test_EZProcessingPlugin():
 
     ArrayRotate = EZProcessingPlugin(np.rot90)
     assert ArrayRotate()
+
+
+def test_input_picklability():
+    import threading
+    import numpy as np
+    from ..processingplugin import Input, _is_picklable, _picklable_types
+
+    assert _is_picklable(np.zeros((64, 64)))
+    assert _is_picklable([1, "a", np.zeros(3)])
+    assert not _is_picklable(threading.Lock())
+    assert not _is_picklable(np.array([threading.Lock()], dtype=object))
+    assert _picklable_types[type(threading.Lock())] is False  # serialized only once per type
+
+    cyclic = [1]
+    cyclic.append(cyclic)
+    assert _is_picklable(cyclic)
+    assert not _is_picklable({"lock": [threading.Lock()], "self": cyclic})
+
+    value = np.zeros((64, 64))
+    i = Input(name="frame")
+    i.value = value
+    assert i.value is value
+
+
+def test_variable_layout():
+    from ..processingplugin import ProcessingPlugin, Input, InputOutput, Output
+
+    class MaskProcessingPlugin(ProcessingPlugin):
+        data = Input(default=1)
+        mask = InputOutput()
+        masked_data = Output()
+
+    layout = MaskProcessingPlugin._variable_layout()
+    assert MaskProcessingPlugin._variable_layout() is layout  # computed once, when the class is created
+    assert [name for name, *_ in layout] == ["data", "mask", "masked_data"]
+
+    p1 = MaskProcessingPlugin()
+    p2 = MaskProcessingPlugin()
+    assert set(p1.inputs) == {"data", "mask"}
+    assert set(p1.outputs) == {"mask", "masked_data"}
+    assert p1.inputs["mask"] is p1.outputs["mask"] is p1.mask
+    assert p1.data is not p2.data
+    assert p1.data._map_inputs is not p2.data._map_inputs
+    assert p1.data.parent is p1
+
+    # Variables added or replaced after the class was first instantiated
+    MaskProcessingPlugin.threshold = Input(default=.5)
+    MaskProcessingPlugin.data = Input(default=2)
+    p3 = MaskProcessingPlugin()
+    assert set(p3.inputs) == {"data", "mask", "threshold"}
+    assert (p3.data.value, p3.threshold.name) == (2, "threshold")
+    assert p3.inverted_vars[MaskProcessingPlugin.threshold] == "threshold"
+
+
+def test_var_slots():
+    from ..processingplugin import Input, InputOutput, Output
+
+    for var in (Input(name="a", default=1), Output(name="b"), InputOutput(name="c")):
+        assert not hasattr(var, "__dict__")
+        with pytest.raises(AttributeError):
+            var.undeclared = None
+
+    i = Input(name="a", default=1, units="nm", min=1, max=10)
+    clone = i._clone()
+    assert (clone.name, clone.value, clone.units, clone.limits) == ("a", 1, "nm", (1, 10))
+    clone.value = 2
+    assert i.value == 1
+
+
+def test_unpickle_by_class_name(monkeypatch):
+    import pickle
+    import xicam.plugins
+    from xicam.plugins import XicamPluginManager, RegistrySnapshot
+    from xicam.plugins.processingplugin import _ProcessingPluginRetriever
+
+    manager = XicamPluginManager(RegistrySnapshot(
+        {"ProcessingPlugin": ("xicam.plugins.processingplugin", "ProcessingPlugin")},
+        [("ProcessingPlugin", "Picklable Sum", __name__, "PicklableSumPlugin")]))
+    monkeypatch.setattr(xicam.plugins, "manager", manager)
+    assert manager.get_plugin_by_class_name("PicklableSumPlugin") is PicklableSumPlugin
+    assert manager.get_plugin_by_class_name("PicklableSumPlugin", "GUIPlugin") is None
+
+    workflow = [PicklableSumPlugin() for _ in range(3)]
+    restored = pickle.loads(pickle.dumps(workflow))
+    assert [type(p) for p in restored] == [PicklableSumPlugin] * 3
+    restored[1].evaluate()
+    assert restored[1].c.value == 3
+
+    with pytest.raises(ValueError):
+        _ProcessingPluginRetriever()("MissingPlugin", {})
+
+
+
+def test_inplace_inputoutput():
+    import numpy as np
+    from ..processingplugin import ProcessingPlugin, Input, InputOutput, Output
+
+    class ApplyMask(ProcessingPlugin):
+        data = InputOutput(inplace=True)
+        mask = Input()
+
+        def evaluate(self):
+            self.data.value[~self.mask.value] = 0
+
+    class Source(ProcessingPlugin):
+        frame = Output()
+
+    class Total(ProcessingPlugin):
+        data = Input()
+
+    source = Source()
+    masking = ApplyMask()
+    source.frame.connect(masking.data)
+    source.frame.connect(masking.data)  # reconnecting is harmless
+    with pytest.raises(ValueError):
+        source.frame.connect(Total().data)
+    with pytest.raises(ValueError):
+        ApplyMask().data.subscribe(source.frame)
+
+    frame = np.ones((4, 4))
+    masking.data.value = frame
+    masking.mask.value = np.eye(4, dtype=bool)
+    masking.evaluate()
+    assert masking.data.value is frame
+    assert frame.sum() == 4
+
+    frame.flags.writeable = False
+    with pytest.raises(ValueError):
+        masking.data.value = frame
+
+    # Without the in-place contract, an upstream variable may be shared
+    shared = Source()
+    shared.frame.connect(InputOutput(name="copy"))
+    shared.frame.connect(Total().data)
+
+
+def test_inplace_default():
+    import numpy as np
+    from ..processingplugin import InputOutput
+
+    default = np.zeros(3)
+    assert InputOutput(default=default, inplace=True).value is default
+
+    default.flags.writeable = False
+    assert InputOutput(default=default).value is default
+    with pytest.raises(ValueError):
+        InputOutput(default=default, inplace=True)
+
+
+def test_inplace_rewiring():
+    import gc
+    from ..processingplugin import ProcessingPlugin, Input, InputOutput, Output
+
+    class Source(ProcessingPlugin):
+        frame = Output()
+
+    class ApplyMask(ProcessingPlugin):
+        data = InputOutput(inplace=True)
+
+    class Total(ProcessingPlugin):
+        data = Input()
+
+    source = Source()
+    masking = ApplyMask()
+    source.frame.connect(masking.data)
+    masking.clearConnections()
+    total = Total()
+    source.frame.connect(total.data)  # the in-place consumer is gone
+
+    source.frame.disconnect(total.data)
+    assert not total.data._map_inputs
+    masking.data.subscribe(source.frame)
+    masking.data.unsubscribe(source.frame)
+    source.frame.connect(total.data)
+
+    # Consumers are held weakly, so removed plugins are not kept alive
+    del total
+    gc.collect()
+    source.frame.connect(ApplyMask().data)
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+
+def test_cache_hits():
+    from xicam.plugins.operationcache import ResultCache
+
+    cache = ResultCache()
+    calls = []
+
+    def func(image, scale=1):
+        calls.append(scale)
+        return image * scale
+
+    image = np.arange(10)
+    first = cache.call(func, {'image': image, 'scale': 2})
+    second = cache.call(func, {'image': image.copy(), 'scale': 2})
+    assert second is first
+    assert calls == [2]
+    with pytest.raises(ValueError):
+        first[0] = 1  # shared results are read-only
+
+    cache.call(func, {'image': image, 'scale': 3})
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_cache_eviction():
+    from xicam.plugins.operationcache import ResultCache
+
+    cache = ResultCache(max_bytes=2 * 8 * 100)
+
+    def func(offset):
+        return np.zeros(100, dtype=np.float64) + offset
+
+    for offset in range(3):
+        cache.call(func, {'offset': offset})
+    assert len(cache) == 2
+    assert cache.bytes <= cache.max_bytes
+
+    # The least recently used result (offset=0) was evicted
+    cache.call(func, {'offset': 0})
+    assert cache.stats()['hits'] == 0
+
+
+def test_operation_cache_results():
+    from xicam.plugins.operationcache import result_cache
+    from xicam.plugins.operationplugin import cache_results, operation, output_names
+
+    calls = []
+
+    @operation
+    @output_names('sum')
+    @cache_results
+    def func(a, b=1):
+        calls.append((a, b))
+        return a + b
+
+    op = func()
+    op.filled_values['b'] = 2
+    assert op(a=1) == 3
+    assert op(a=1) == 3
+    assert calls == [(1, 2)]
+
+    op.filled_values['b'] = 3
+    assert op(a=1) == 4
+    assert len(calls) == 2
+    result_cache.clear()
+
+
+def test_async_operation_cache_results():
+    import asyncio
+    from xicam.plugins.operationcache import result_cache
+    from xicam.plugins.operationplugin import cache_results, operation, output_names
+
+    calls = []
+
+    @operation
+    @output_names('sum')
+    @cache_results
+    async def func(a, b=1):
+        calls.append((a, b))
+        return a + b
+
+    result_cache.clear()
+    op = func()
+    assert op(a=1) == 2
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(op.acall(a=1)) == 2
+        assert loop.run_until_complete(op.acall(a=2)) == 3
+    finally:
+        loop.close()
+    assert calls == [(1, 1), (2, 1)]
+    assert result_cache.stats()['hits'] == 1
+    assert result_cache.stats()['misses'] == 2
+    result_cache.clear()
+
+
+def test_cache_leaves_inputs_writable():
+    from xicam.plugins.operationcache import ResultCache
+
+    cache = ResultCache()
+    image = np.arange(10)
+    result = cache.call(lambda image: image, {'image': image})
+    assert not result.flags.writeable
+    assert image.flags.writeable
+
+
+def test_cache_hashes_datetimes():
+    from xicam.plugins.operationcache import ResultCache
+
+    cache = ResultCache()
+
+    def latest(times):
+        return times.max()
+
+    times = np.array(['2020-01-01', '2020-01-02'], dtype='datetime64[D]')
+    assert cache.call(latest, {'times': times}) == np.datetime64('2020-01-02')
+    cache.call(latest, {'times': times.copy()})
+    cache.call(latest, {'times': times[::-1]})
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
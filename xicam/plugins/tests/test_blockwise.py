@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+
+def test_apply_blockwise_memmap(tmp_path):
+    from xicam.plugins.blockwise import apply_blockwise
+    from xicam.plugins.operationplugin import chunkable, operation, output_names
+
+    block_shapes = []
+
+    @operation
+    @output_names('corrected')
+    @chunkable('frames', axis=0)
+    @chunkable('corrected', axis=0)
+    def subtract_dark(frames: np.ndarray, dark: np.ndarray) -> np.ndarray:
+        block_shapes.append(frames.shape)
+        return frames - dark
+
+    frames = np.lib.format.open_memmap(str(tmp_path / 'frames.npy'), mode='w+', dtype=np.float32, shape=(10, 4, 4))
+    frames[:] = np.arange(10, dtype=np.float32)[:, None, None]
+    dark = np.ones((4, 4), dtype=np.float32)
+
+    out = np.lib.format.open_memmap(str(tmp_path / 'out.npy'), mode='w+', dtype=np.float32, shape=(10, 4, 4))
+    result = apply_blockwise(subtract_dark(), out={'corrected': out}, block_size=3, frames=frames, dark=dark)
+
+    assert result['corrected'] is out
+    assert block_shapes == [(3, 4, 4), (3, 4, 4), (3, 4, 4), (1, 4, 4)]
+    np.testing.assert_array_equal(out, frames - dark)
+
+
+def test_apply_blockwise_allocates():
+    from xicam.plugins.blockwise import apply_blockwise
+    from xicam.plugins.operationplugin import chunkable, operation, output_names
+
+    @operation
+    @output_names('total')
+    @chunkable('image', axis=1)
+    @chunkable('total', axis=0)
+    def column_sum(image: np.ndarray) -> np.ndarray:
+        return image.sum(axis=0)
+
+    image = np.arange(20).reshape(4, 5)
+    shapes = {}
+
+    def allocate(name, shape, dtype):
+        shapes[name] = shape
+        return np.zeros(shape, dtype=dtype)
+
+    result = apply_blockwise(column_sum(), out=allocate, block_bytes=image.itemsize * 4 * 2, image=image)
+    assert shapes == {'total': (5,)}
+    np.testing.assert_array_equal(result['total'], image.sum(axis=0))
+
+
+def test_apply_blockwise_undeclared_output():
+    from xicam.plugins.blockwise import apply_blockwise
+    from xicam.plugins.operationplugin import chunkable, operation, output_names
+
+    @operation
+    @output_names('mean')
+    @chunkable('frames')
+    def mean(frames: np.ndarray) -> float:
+        return frames.mean()
+
+    with pytest.raises(ValueError):
+        apply_blockwise(mean(), frames=np.zeros((4, 4)))
+
+
+def test_apply_blockwise_empty():
+    from xicam.plugins.blockwise import apply_blockwise
+    from xicam.plugins.operationplugin import chunkable, operation, output_names
+
+    @operation
+    @output_names('corrected')
+    @chunkable('frames', axis=0)
+    @chunkable('corrected', axis=0)
+    def subtract_dark(frames: np.ndarray, dark: np.ndarray) -> np.ndarray:
+        return frames - dark
+
+    result = apply_blockwise(subtract_dark(), frames=np.zeros((0, 4, 4), dtype=np.float32),
+                             dark=np.ones((4, 4), dtype=np.float32))
+    assert result['corrected'].shape == (0, 4, 4)
+    assert result['corrected'].dtype == np.float32